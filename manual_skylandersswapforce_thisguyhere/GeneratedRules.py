@@ -0,0 +1,350 @@
+# Generated by generate_rules.py from the requires of data/locations.json and data/regions.json, don't edit it.
+# Rules.py only uses it while requires_hash matches the loaded requires and categories.
+
+from .Items import category_item_names
+from .Rules import RequiresConst, RequiresItem, RequiresCategory, RequiresNot, RequiresSequence, RequiresAll, RequiresAny
+
+requires_hash = 'bef5b415fa4c7e4cc69fc87abf5698b2266b3c5d69c52e90388ef1b7299cd79e'
+
+def requires_0():
+    # (|@Skylander - Giant| or (|@Skylander - Earth| and |@Skylander - Fast|))
+    return RequiresAny((RequiresCategory('Skylander - Giant', category_item_names['Skylander - Giant'], 1, None), RequiresAll((RequiresCategory('Skylander - Earth', category_item_names['Skylander - Earth'], 1, None), RequiresCategory('Skylander - Fast', category_item_names['Skylander - Fast'], 1, None), )), ))
+
+def requires_1():
+    # |@Skylander - Air|
+    return RequiresCategory('Skylander - Air', category_item_names['Skylander - Air'], 1, None)
+
+def requires_2():
+    # |@Skylander - Earth|
+    return RequiresCategory('Skylander - Earth', category_item_names['Skylander - Earth'], 1, None)
+
+def requires_3():
+    # |@Skylander - Fast|
+    return RequiresCategory('Skylander - Fast', category_item_names['Skylander - Fast'], 1, None)
+
+def requires_4():
+    # |@Skylander - Fire|
+    return RequiresCategory('Skylander - Fire', category_item_names['Skylander - Fire'], 1, None)
+
+def requires_5():
+    # |@Skylander - Giant|
+    return RequiresCategory('Skylander - Giant', category_item_names['Skylander - Giant'], 1, None)
+
+def requires_6():
+    # |@Skylander - Giant| and |@Skylander - Water|
+    return RequiresAll((RequiresCategory('Skylander - Giant', category_item_names['Skylander - Giant'], 1, None), RequiresCategory('Skylander - Water', category_item_names['Skylander - Water'], 1, None), ))
+
+def requires_7():
+    # |@Skylander - Life|
+    return RequiresCategory('Skylander - Life', category_item_names['Skylander - Life'], 1, None)
+
+def requires_8():
+    # |@Skylander - Magic|
+    return RequiresCategory('Skylander - Magic', category_item_names['Skylander - Magic'], 1, None)
+
+def requires_9():
+    # |@Skylander - Tech|
+    return RequiresCategory('Skylander - Tech', category_item_names['Skylander - Tech'], 1, None)
+
+def requires_10():
+    # |@Skylander - Undead|
+    return RequiresCategory('Skylander - Undead', category_item_names['Skylander - Undead'], 1, None)
+
+def requires_11():
+    # |@Skylander - Water|
+    return RequiresCategory('Skylander - Water', category_item_names['Skylander - Water'], 1, None)
+
+def requires_12():
+    # |Bash| or |All Earth Skylanders|
+    return RequiresAny((RequiresItem('Bash', 1, None), RequiresItem('All Earth Skylanders', 1, None), ))
+
+def requires_13():
+    # |Bouncer| or |All Tech Skylanders|
+    return RequiresAny((RequiresItem('Bouncer', 1, None), RequiresItem('All Tech Skylanders', 1, None), ))
+
+def requires_14():
+    # |Chill| or |All Water Skylanders|
+    return RequiresAny((RequiresItem('Chill', 1, None), RequiresItem('All Water Skylanders', 1, None), ))
+
+def requires_15():
+    # |Chop Chop| or |All Undead Skylanders|
+    return RequiresAny((RequiresItem('Chop Chop', 1, None), RequiresItem('All Undead Skylanders', 1, None), ))
+
+def requires_16():
+    # |Crusher| or |All Earth Skylanders|
+    return RequiresAny((RequiresItem('Crusher', 1, None), RequiresItem('All Earth Skylanders', 1, None), ))
+
+def requires_17():
+    # |Cynder| or |All Undead Skylanders|
+    return RequiresAny((RequiresItem('Cynder', 1, None), RequiresItem('All Undead Skylanders', 1, None), ))
+
+def requires_18():
+    # |Double Trouble| or |All Magic Skylanders|
+    return RequiresAny((RequiresItem('Double Trouble', 1, None), RequiresItem('All Magic Skylanders', 1, None), ))
+
+def requires_19():
+    # |Drill Sergeant| or |All Tech Skylanders|
+    return RequiresAny((RequiresItem('Drill Sergeant', 1, None), RequiresItem('All Tech Skylanders', 1, None), ))
+
+def requires_20():
+    # |Drobot| or |All Tech Skylanders|
+    return RequiresAny((RequiresItem('Drobot', 1, None), RequiresItem('All Tech Skylanders', 1, None), ))
+
+def requires_21():
+    # |Eruptor| or |All Fire Skylanders|
+    return RequiresAny((RequiresItem('Eruptor', 1, None), RequiresItem('All Fire Skylanders', 1, None), ))
+
+def requires_22():
+    # |Eye-Brawl| or |All Undead Skylanders|
+    return RequiresAny((RequiresItem('Eye-Brawl', 1, None), RequiresItem('All Undead Skylanders', 1, None), ))
+
+def requires_23():
+    # |Flameslinger| or |All Fire Skylanders|
+    return RequiresAny((RequiresItem('Flameslinger', 1, None), RequiresItem('All Fire Skylanders', 1, None), ))
+
+def requires_24():
+    # |Flashwing| or |All Earth Skylanders|
+    return RequiresAny((RequiresItem('Flashwing', 1, None), RequiresItem('All Earth Skylanders', 1, None), ))
+
+def requires_25():
+    # |Fright Rider| or |All Undead Skylanders|
+    return RequiresAny((RequiresItem('Fright Rider', 1, None), RequiresItem('All Undead Skylanders', 1, None), ))
+
+def requires_26():
+    # |Gill Grunt| or |All Water Skylanders|
+    return RequiresAny((RequiresItem('Gill Grunt', 1, None), RequiresItem('All Water Skylanders', 1, None), ))
+
+def requires_27():
+    # |Hex| or |All Undead Skylanders|
+    return RequiresAny((RequiresItem('Hex', 1, None), RequiresItem('All Undead Skylanders', 1, None), ))
+
+def requires_28():
+    # |Hot Dog| or |All Fire Skylanders|
+    return RequiresAny((RequiresItem('Hot Dog', 1, None), RequiresItem('All Fire Skylanders', 1, None), ))
+
+def requires_29():
+    # |Hot Head| or |All Fire Skylanders|
+    return RequiresAny((RequiresItem('Hot Head', 1, None), RequiresItem('All Fire Skylanders', 1, None), ))
+
+def requires_30():
+    # |Ignitor| or |All Fire Skylanders|
+    return RequiresAny((RequiresItem('Ignitor', 1, None), RequiresItem('All Fire Skylanders', 1, None), ))
+
+def requires_31():
+    # |Jet-Vac| or |All Air Skylanders|
+    return RequiresAny((RequiresItem('Jet-Vac', 1, None), RequiresItem('All Air Skylanders', 1, None), ))
+
+def requires_32():
+    # |Lightning Rod| or |All Air Skylanders|
+    return RequiresAny((RequiresItem('Lightning Rod', 1, None), RequiresItem('All Air Skylanders', 1, None), ))
+
+def requires_33():
+    # |Ninjini| or |All Magic Skylanders|
+    return RequiresAny((RequiresItem('Ninjini', 1, None), RequiresItem('All Magic Skylanders', 1, None), ))
+
+def requires_34():
+    # |Pop Fizz| or |All Magic Skylanders|
+    return RequiresAny((RequiresItem('Pop Fizz', 1, None), RequiresItem('All Magic Skylanders', 1, None), ))
+
+def requires_35():
+    # |Prism Break| or |All Earth Skylanders|
+    return RequiresAny((RequiresItem('Prism Break', 1, None), RequiresItem('All Earth Skylanders', 1, None), ))
+
+def requires_36():
+    # |Progressive Chapter:10| or |Aerial Attack!|
+    return RequiresAny((RequiresItem('Progressive Chapter', 10, None), RequiresItem('Aerial Attack!', 1, None), ))
+
+def requires_37():
+    # |Progressive Chapter:11| or |Drill-X's Big Rig|
+    return RequiresAny((RequiresItem('Progressive Chapter', 11, None), RequiresItem("Drill-X's Big Rig", 1, None), ))
+
+def requires_38():
+    # |Progressive Chapter:12| or |Molekin Mountain|
+    return RequiresAny((RequiresItem('Progressive Chapter', 12, None), RequiresItem('Molekin Mountain', 1, None), ))
+
+def requires_39():
+    # |Progressive Chapter:13| or |The Oracle|
+    return RequiresAny((RequiresItem('Progressive Chapter', 13, None), RequiresItem('The Oracle', 1, None), ))
+
+def requires_40():
+    # |Progressive Chapter:14| or |Autogyro Adventure|
+    return RequiresAny((RequiresItem('Progressive Chapter', 14, None), RequiresItem('Autogyro Adventure', 1, None), ))
+
+def requires_41():
+    # |Progressive Chapter:15| or |Lost City of Arkus|
+    return RequiresAny((RequiresItem('Progressive Chapter', 15, None), RequiresItem('Lost City of Arkus', 1, None), ))
+
+def requires_42():
+    # |Progressive Chapter:16| or |Bringing Order to Kaos!|
+    return RequiresAny((RequiresItem('Progressive Chapter', 16, None), RequiresItem('Bringing Order to Kaos!', 1, None), ))
+
+def requires_43():
+    # |Progressive Chapter:1| or |Time of the Giants|
+    return RequiresAny((RequiresItem('Progressive Chapter', 1, None), RequiresItem('Time of the Giants', 1, None), ))
+
+def requires_44():
+    # |Progressive Chapter:2| or |Junkyard Isles|
+    return RequiresAny((RequiresItem('Progressive Chapter', 2, None), RequiresItem('Junkyard Isles', 1, None), ))
+
+def requires_45():
+    # |Progressive Chapter:3| or |Rumbletown|
+    return RequiresAny((RequiresItem('Progressive Chapter', 3, None), RequiresItem('Rumbletown', 1, None), ))
+
+def requires_46():
+    # |Progressive Chapter:4| or |Cutthroat Carnival|
+    return RequiresAny((RequiresItem('Progressive Chapter', 4, None), RequiresItem('Cutthroat Carnival', 1, None), ))
+
+def requires_47():
+    # |Progressive Chapter:5| or |Glacier Gully|
+    return RequiresAny((RequiresItem('Progressive Chapter', 5, None), RequiresItem('Glacier Gully', 1, None), ))
+
+def requires_48():
+    # |Progressive Chapter:6| or |Secret Vault of Secrets|
+    return RequiresAny((RequiresItem('Progressive Chapter', 6, None), RequiresItem('Secret Vault of Secrets', 1, None), ))
+
+def requires_49():
+    # |Progressive Chapter:7| or |Wilikin Village|
+    return RequiresAny((RequiresItem('Progressive Chapter', 7, None), RequiresItem('Wilikin Village', 1, None), ))
+
+def requires_50():
+    # |Progressive Chapter:8| or |Troll Home Security|
+    return RequiresAny((RequiresItem('Progressive Chapter', 8, None), RequiresItem('Troll Home Security', 1, None), ))
+
+def requires_51():
+    # |Progressive Chapter:9| or |Kaos' Kastle|
+    return RequiresAny((RequiresItem('Progressive Chapter', 9, None), RequiresItem("Kaos' Kastle", 1, None), ))
+
+def requires_52():
+    # |Shroomboom| or |All Life Skylanders|
+    return RequiresAny((RequiresItem('Shroomboom', 1, None), RequiresItem('All Life Skylanders', 1, None), ))
+
+def requires_53():
+    # |Slam Bam| or |All Water Skylanders|
+    return RequiresAny((RequiresItem('Slam Bam', 1, None), RequiresItem('All Water Skylanders', 1, None), ))
+
+def requires_54():
+    # |Sonic Boom| or |All Air Skylanders|
+    return RequiresAny((RequiresItem('Sonic Boom', 1, None), RequiresItem('All Air Skylanders', 1, None), ))
+
+def requires_55():
+    # |Sprocket| or |All Tech Skylanders|
+    return RequiresAny((RequiresItem('Sprocket', 1, None), RequiresItem('All Tech Skylanders', 1, None), ))
+
+def requires_56():
+    # |Spyro| or |All Magic Skylanders|
+    return RequiresAny((RequiresItem('Spyro', 1, None), RequiresItem('All Magic Skylanders', 1, None), ))
+
+def requires_57():
+    # |Stealth Elf| or |All Life Skylanders|
+    return RequiresAny((RequiresItem('Stealth Elf', 1, None), RequiresItem('All Life Skylanders', 1, None), ))
+
+def requires_58():
+    # |Stump Smash| or |All Life Skylanders|
+    return RequiresAny((RequiresItem('Stump Smash', 1, None), RequiresItem('All Life Skylanders', 1, None), ))
+
+def requires_59():
+    # |Swarm| or |All Air Skylanders|
+    return RequiresAny((RequiresItem('Swarm', 1, None), RequiresItem('All Air Skylanders', 1, None), ))
+
+def requires_60():
+    # |Terrafin| or |All Earth Skylanders|
+    return RequiresAny((RequiresItem('Terrafin', 1, None), RequiresItem('All Earth Skylanders', 1, None), ))
+
+def requires_61():
+    # |Thumpback| or |All Water Skylanders|
+    return RequiresAny((RequiresItem('Thumpback', 1, None), RequiresItem('All Water Skylanders', 1, None), ))
+
+def requires_62():
+    # |Tree Rex| or |All Life Skylanders|
+    return RequiresAny((RequiresItem('Tree Rex', 1, None), RequiresItem('All Life Skylanders', 1, None), ))
+
+def requires_63():
+    # |Trigger Happy| or |All Tech Skylanders|
+    return RequiresAny((RequiresItem('Trigger Happy', 1, None), RequiresItem('All Tech Skylanders', 1, None), ))
+
+def requires_64():
+    # |Whirlwind| or |All Air Skylanders|
+    return RequiresAny((RequiresItem('Whirlwind', 1, None), RequiresItem('All Air Skylanders', 1, None), ))
+
+def requires_65():
+    # |Wrecking Ball| or |All Magic Skylanders|
+    return RequiresAny((RequiresItem('Wrecking Ball', 1, None), RequiresItem('All Magic Skylanders', 1, None), ))
+
+def requires_66():
+    # |Zap| or |All Water Skylanders|
+    return RequiresAny((RequiresItem('Zap', 1, None), RequiresItem('All Water Skylanders', 1, None), ))
+
+def requires_67():
+    # |Zook| or |All Life Skylanders|
+    return RequiresAny((RequiresItem('Zook', 1, None), RequiresItem('All Life Skylanders', 1, None), ))
+
+requires_builders = {
+    '(|@Skylander - Giant| or (|@Skylander - Earth| and |@Skylander - Fast|))': requires_0,
+    '|@Skylander - Air|': requires_1,
+    '|@Skylander - Earth|': requires_2,
+    '|@Skylander - Fast|': requires_3,
+    '|@Skylander - Fire|': requires_4,
+    '|@Skylander - Giant|': requires_5,
+    '|@Skylander - Giant| and |@Skylander - Water|': requires_6,
+    '|@Skylander - Life|': requires_7,
+    '|@Skylander - Magic|': requires_8,
+    '|@Skylander - Tech|': requires_9,
+    '|@Skylander - Undead|': requires_10,
+    '|@Skylander - Water|': requires_11,
+    '|Bash| or |All Earth Skylanders|': requires_12,
+    '|Bouncer| or |All Tech Skylanders|': requires_13,
+    '|Chill| or |All Water Skylanders|': requires_14,
+    '|Chop Chop| or |All Undead Skylanders|': requires_15,
+    '|Crusher| or |All Earth Skylanders|': requires_16,
+    '|Cynder| or |All Undead Skylanders|': requires_17,
+    '|Double Trouble| or |All Magic Skylanders|': requires_18,
+    '|Drill Sergeant| or |All Tech Skylanders|': requires_19,
+    '|Drobot| or |All Tech Skylanders|': requires_20,
+    '|Eruptor| or |All Fire Skylanders|': requires_21,
+    '|Eye-Brawl| or |All Undead Skylanders|': requires_22,
+    '|Flameslinger| or |All Fire Skylanders|': requires_23,
+    '|Flashwing| or |All Earth Skylanders|': requires_24,
+    '|Fright Rider| or |All Undead Skylanders|': requires_25,
+    '|Gill Grunt| or |All Water Skylanders|': requires_26,
+    '|Hex| or |All Undead Skylanders|': requires_27,
+    '|Hot Dog| or |All Fire Skylanders|': requires_28,
+    '|Hot Head| or |All Fire Skylanders|': requires_29,
+    '|Ignitor| or |All Fire Skylanders|': requires_30,
+    '|Jet-Vac| or |All Air Skylanders|': requires_31,
+    '|Lightning Rod| or |All Air Skylanders|': requires_32,
+    '|Ninjini| or |All Magic Skylanders|': requires_33,
+    '|Pop Fizz| or |All Magic Skylanders|': requires_34,
+    '|Prism Break| or |All Earth Skylanders|': requires_35,
+    '|Progressive Chapter:10| or |Aerial Attack!|': requires_36,
+    "|Progressive Chapter:11| or |Drill-X's Big Rig|": requires_37,
+    '|Progressive Chapter:12| or |Molekin Mountain|': requires_38,
+    '|Progressive Chapter:13| or |The Oracle|': requires_39,
+    '|Progressive Chapter:14| or |Autogyro Adventure|': requires_40,
+    '|Progressive Chapter:15| or |Lost City of Arkus|': requires_41,
+    '|Progressive Chapter:16| or |Bringing Order to Kaos!|': requires_42,
+    '|Progressive Chapter:1| or |Time of the Giants|': requires_43,
+    '|Progressive Chapter:2| or |Junkyard Isles|': requires_44,
+    '|Progressive Chapter:3| or |Rumbletown|': requires_45,
+    '|Progressive Chapter:4| or |Cutthroat Carnival|': requires_46,
+    '|Progressive Chapter:5| or |Glacier Gully|': requires_47,
+    '|Progressive Chapter:6| or |Secret Vault of Secrets|': requires_48,
+    '|Progressive Chapter:7| or |Wilikin Village|': requires_49,
+    '|Progressive Chapter:8| or |Troll Home Security|': requires_50,
+    "|Progressive Chapter:9| or |Kaos' Kastle|": requires_51,
+    '|Shroomboom| or |All Life Skylanders|': requires_52,
+    '|Slam Bam| or |All Water Skylanders|': requires_53,
+    '|Sonic Boom| or |All Air Skylanders|': requires_54,
+    '|Sprocket| or |All Tech Skylanders|': requires_55,
+    '|Spyro| or |All Magic Skylanders|': requires_56,
+    '|Stealth Elf| or |All Life Skylanders|': requires_57,
+    '|Stump Smash| or |All Life Skylanders|': requires_58,
+    '|Swarm| or |All Air Skylanders|': requires_59,
+    '|Terrafin| or |All Earth Skylanders|': requires_60,
+    '|Thumpback| or |All Water Skylanders|': requires_61,
+    '|Tree Rex| or |All Life Skylanders|': requires_62,
+    '|Trigger Happy| or |All Tech Skylanders|': requires_63,
+    '|Whirlwind| or |All Air Skylanders|': requires_64,
+    '|Wrecking Ball| or |All Magic Skylanders|': requires_65,
+    '|Zap| or |All Water Skylanders|': requires_66,
+    '|Zook| or |All Life Skylanders|': requires_67,
+}
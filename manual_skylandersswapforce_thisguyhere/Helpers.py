@@ -1,8 +1,9 @@
 from BaseClasses import MultiWorld, Item
-from typing import Optional, List
+from typing import Callable, NamedTuple, Optional, List
+from weakref import WeakKeyDictionary
 from worlds.AutoWorld import World
 from .Data import category_table
-from .Items import ManualItem
+from .Items import ManualItem, category_item_names
 from .Locations import ManualLocation
 from .hooks.Helpers import before_is_category_enabled, before_is_item_enabled, before_is_location_enabled
 
@@ -92,9 +93,45 @@ def _is_manualobject_enabled(multiworld: MultiWorld, player: int, object: any) -
 
     return enabled
 
+def passthrough_hook(hook: Callable) -> Callable:
+    """Marks a hook as returning its first argument unchanged, like the default before_create_item and after_create_item,
+    so the world can skip calling it. Remove it from a hook once you change what the hook does."""
+    hook.passthrough_hook = True
+    return hook
+
+def is_passthrough_hook(hook: Callable) -> bool:
+    """Returns if a hook is marked with @passthrough_hook"""
+    return getattr(hook, "passthrough_hook", False)
+
+######################
+# Item index
+######################
+#
+# The items of every player (pooled and placed), sorted out in one pass over multiworld.get_items() the first time
+# they're asked for instead of filtering every item of the multiworld on each call.
+# Checking if the items changed would take that pass again, so the index is only rebuilt when the multiworld gets
+# another item pool list or invalidate_item_index is called. The world calls it where the items change: at the end of
+# create_items, before and after the placements of generate_basic, at the start of pre_fill (AP moves the start inventory
+# from the pool in between) and in post_fill (the fill placed the items). Call it after changing the items anywhere else.
+_item_indexes = WeakKeyDictionary()
+
+def get_item_index(multiworld: MultiWorld) -> dict[int, List[Item]]:
+    """Return the pooled and placed items of each player of the multiworld"""
+    index = _item_indexes.get(multiworld)
+    if index is None or index[0] is not multiworld.itempool:
+        items = {}
+        for item in multiworld.get_items():
+            items.setdefault(item.player, []).append(item)
+        index = _item_indexes[multiworld] = (multiworld.itempool, items)
+    return index[1]
+
+def invalidate_item_index(multiworld: MultiWorld):
+    """Forget the item index of the multiworld, it's built again the next time it's needed"""
+    _item_indexes.pop(multiworld, None)
+
 def get_items_for_player(multiworld: MultiWorld, player: int, includePrecollected: bool = False) -> List[Item]:
     """Return list of items of a player including placed items"""
-    items = [i for i in multiworld.get_items() if i.player == player]
+    items = list(get_item_index(multiworld).get(player, ()))
     if includePrecollected:
         items.extend(multiworld.precollected_items.get(player, []))
     return items
@@ -126,3 +163,55 @@ def get_items_with_value(world: World, multiworld: MultiWorld, value: str, playe
                             and i.name in world.item_name_groups.get(f'has_{value}_value', [])}
         world.item_values[player][value] = item_with_values
     return world.item_values[player].get(value)
+
+######################
+# Requires functions
+######################
+#
+# The functions used in requires as {func()} can declare what their result depends on with the decorators below,
+# so the rules know how long a result can be reused. Functions without one are called on every check.
+
+class RequiresFunctionCaching(NamedTuple):
+    kind: str
+    items: tuple[str, ...] = ()
+
+REQUIRES_STATE_INDEPENDENT = "state_independent" # called once per player, when the rules are set
+REQUIRES_ITEMS = "items" # reused while the counts of the listed items don't change
+REQUIRES_STATE = "state" # reused while the state's items and reachable regions don't change
+REQUIRES_DYNAMIC = "dynamic" # never reused
+
+requires_function_caching: dict[Callable, RequiresFunctionCaching] = {}
+
+def get_requires_function_caching(func: Callable) -> RequiresFunctionCaching:
+    """Returns how the results of a requires function can be reused, as declared by its decorator"""
+    return requires_function_caching.get(func, RequiresFunctionCaching(REQUIRES_DYNAMIC))
+
+def state_independent(func: Callable) -> Callable:
+    """Marks a requires function as only depending on the options and the player's item counts, not on the
+    CollectionState, so its calls are made once per player when the rules are set instead of on every check."""
+    requires_function_caching[func] = RequiresFunctionCaching(REQUIRES_STATE_INDEPENDENT)
+    return func
+
+def depends_on_items(*items: str) -> Callable[[Callable], Callable]:
+    """Marks a requires function as only depending on the collected counts of the listed items ("@Category" for every item
+    of a category), its result is reused until one of them changes. eg. @depends_on_items("Coin", "@Keys")"""
+    names = []
+    for item in items:
+        names.extend(category_item_names.get(item[1:], ()) if item.startswith("@") else [item])
+    names = tuple(dict.fromkeys(names))
+
+    def decorator(func: Callable) -> Callable:
+        requires_function_caching[func] = RequiresFunctionCaching(REQUIRES_ITEMS, names)
+        return func
+    return decorator
+
+def depends_on_state(func: Callable) -> Callable:
+    """Marks a requires function as only depending on the player's items and reachable regions of the CollectionState,
+    like the functions checking state.can_reach, its result is reused until either changes."""
+    requires_function_caching[func] = RequiresFunctionCaching(REQUIRES_STATE)
+    return func
+
+def dynamic(func: Callable) -> Callable:
+    """Marks a requires function as depending on anything, it's called on every check. That's the default."""
+    requires_function_caching[func] = RequiresFunctionCaching(REQUIRES_DYNAMIC)
+    return func
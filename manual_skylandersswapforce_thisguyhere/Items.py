@@ -1,4 +1,10 @@
-from BaseClasses import Item
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import MutableSequence
+from random import Random
+from types import MappingProxyType
+from typing import Iterable, Iterator, Optional
+from BaseClasses import Item, ItemClassification
 from .Data import item_table
 from .Game import filler_item_name, starting_index
 
@@ -53,9 +59,44 @@ for item in item_table:
             item_name_groups[group_name] = []
         item_name_groups[group_name].append(item_name)
 
+# frozen category -> item names index, in item order, so |@Category| requires don't have to scan every item
+category_items: dict[str, list[str]] = {}
+for item in item_name_to_item.values():
+    for c in dict.fromkeys(item.get("category", [])):
+        category_items.setdefault(c, []).append(item["name"])
+category_item_names: MappingProxyType[str, tuple[str, ...]] = MappingProxyType({c: tuple(names) for c, names in category_items.items()})
+del category_items
+
+# and the other way around, each item's categories without duplicates, to keep per-category counts of collected items
+item_category_names: MappingProxyType[str, tuple[str, ...]] = MappingProxyType(
+    {item["name"]: tuple(dict.fromkeys(item["category"])) for item in item_name_to_item.values() if item.get("category")})
+
 item_id_to_name[None] = "__Victory__"
 item_name_to_id = {name: id for id, name in item_id_to_name.items()}
 
+def get_item_classification(item: dict) -> ItemClassification:
+    """Returns the classification of an item from its flags, the last of trap, useful, progression and
+    progression_skip_balancing set wins"""
+    classification = ItemClassification.filler
+
+    if "trap" in item and item["trap"]:
+        classification = ItemClassification.trap
+
+    if "useful" in item and item["useful"]:
+        classification = ItemClassification.useful
+
+    if "progression" in item and item["progression"]:
+        classification = ItemClassification.progression
+
+    if "progression_skip_balancing" in item and item["progression_skip_balancing"]:
+        classification = ItemClassification.progression_skip_balancing
+
+    return classification
+
+# each item's classification and id, resolved once, so the copies of an item are created without looking them up again
+item_prototypes: MappingProxyType[str, tuple[ItemClassification, int]] = MappingProxyType(
+    {name: (get_item_classification(item), item_name_to_id[name]) for name, item in item_name_to_item.items()})
+
 
 ######################
 # Item classes
@@ -64,3 +105,246 @@ item_name_to_id = {name: id for id, name in item_id_to_name.items()}
 
 class ManualItem(Item):
     game = "Manual"
+
+
+######################
+# Item pool
+######################
+
+
+class ItemPool(MutableSequence):
+    """The items of a pool in order, a list indexed by name and by category so finding, taking and removing an item
+    doesn't scan the whole pool. Like list.remove, remove takes out the first item equal to the one given (same name and
+    player). Turn it back into a list with to_list before handing it to AP."""
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self.items: dict[int, Item] = {}  # key -> item, in pool order, the keys increase along the pool
+        self.keys_by_name: dict[str, dict[int, None]] = {}  # name -> keys of the items with it, in pool order
+        self.keys_by_category: dict[str, dict[int, None]] = {}  # category -> keys of the items in it, in pool order
+        self.positions: Optional[list[int]] = []  # the keys in pool order, built again when an item is taken out
+        self.next_key = 0
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Item]:
+        # by position like a list, so the items added or taken out while iterating are seen the same way
+        index = 0
+        while index < len(self.items):
+            yield self[index]
+            index += 1
+
+    def __contains__(self, item: Item) -> bool:
+        return self._find(item) is not None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ItemPool(self.items[key] for key in self._positions()[index])
+        return self.items[self._positions()[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = self.to_list()
+            items[index] = value
+            self._rebuild(items)
+            return
+        key = self._positions()[index]
+        self._unindex(key)
+        self.items[key] = value
+        self._index(key)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for key in self._positions()[index]:
+                self._discard(key)
+            return
+        self._discard(self._positions()[index])
+
+    def __iadd__(self, items: Iterable[Item]) -> "ItemPool":
+        self.extend(items)
+        return self
+
+    def __add__(self, items: Iterable[Item]) -> "ItemPool":
+        pool = ItemPool(self.items.values())
+        pool.extend(items)
+        return pool
+
+    def __radd__(self, items: Iterable[Item]) -> "ItemPool":
+        pool = ItemPool(items)
+        pool.extend(self.items.values())
+        return pool
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ItemPool, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ItemPool({self.to_list()!r})"
+
+    def _positions(self) -> list[int]:
+        if self.positions is None:
+            self.positions = list(self.items)
+        return self.positions
+
+    def _find(self, item: Item) -> Optional[int]:
+        for key in self.keys_by_name.get(item.name, ()):
+            if self.items[key] == item:
+                return key
+        return None
+
+    def _indexes(self, key: int) -> list[tuple[dict, str]]:
+        """Returns the (index, name or category) entries the item of key is listed under"""
+        name = self.items[key].name
+        return [(self.keys_by_name, name)] + [(self.keys_by_category, category) for category in item_category_names.get(name, ())]
+
+    def _index(self, key: int):
+        for index, group in self._indexes(key):
+            keys = index.setdefault(group, {})
+            last = next(reversed(keys), -1)
+            keys[key] = None
+            if key < last:
+                # replaced an item in the middle of the pool
+                index[group] = dict.fromkeys(sorted(keys))
+
+    def _unindex(self, key: int):
+        for index, group in self._indexes(key):
+            keys = index[group]
+            del keys[key]
+            if not keys:
+                del index[group]
+
+    def _discard(self, key: int) -> Item:
+        self._unindex(key)
+        self.positions = None
+        return self.items.pop(key)
+
+    def _rebuild(self, items: Iterable[Item]):
+        items = list(items)
+        self.clear()
+        self.extend(items)
+
+    def append(self, item: Item):
+        key = self.next_key
+        self.next_key += 1
+        self.items[key] = item
+        self._index(key)
+        if self.positions is not None:
+            self.positions.append(key)
+
+    def extend(self, items: Iterable[Item]):
+        for item in list(items):
+            self.append(item)
+
+    def insert(self, index: int, item: Item):
+        if index >= len(self.items):
+            self.append(item)
+            return
+        items = self.to_list()
+        items.insert(index, item)
+        self._rebuild(items)
+
+    def remove(self, item: Item):
+        key = self._find(item)
+        if key is None:
+            raise ValueError(f"{item} is not in the item pool")
+        self._discard(key)
+
+    def pop(self, index: int = -1) -> Item:
+        if not self.items:
+            raise IndexError("pop from an empty item pool")
+        if index == -1:
+            return self._discard(next(reversed(self.items)))
+        return self._discard(self._positions()[index])
+
+    def index(self, item: Item, start: int = 0, stop: Optional[int] = None) -> int:
+        start, stop, _ = slice(start, stop).indices(len(self.items))
+        for key in self.keys_by_name.get(item.name, ()):
+            if self.items[key] == item:
+                position = bisect_left(self._positions(), key)
+                if start <= position < stop:
+                    return position
+        raise ValueError(f"{item} is not in the item pool")
+
+    def count(self, item: Item) -> int:
+        return sum(1 for key in self.keys_by_name.get(item.name, ()) if self.items[key] == item)
+
+    def clear(self):
+        self.items.clear()
+        self.keys_by_name.clear()
+        self.keys_by_category.clear()
+        self.positions = []
+
+    def reverse(self):
+        self._rebuild(reversed(self.to_list()))
+
+    def sort(self, *, key=None, reverse: bool = False):
+        self._rebuild(sorted(self.items.values(), key=key, reverse=reverse))
+
+    def copy(self) -> "ItemPool":
+        return ItemPool(self.items.values())
+
+    def count_name(self, name: str) -> int:
+        """Returns how many items named name are in the pool"""
+        return len(self.keys_by_name.get(name, ()))
+
+    def count_category(self, category: str) -> int:
+        """Returns how many items of category are in the pool"""
+        return len(self.keys_by_category.get(category, ()))
+
+    def first(self, name: str) -> Optional[Item]:
+        """Returns the first item named name in the pool, None if there's none"""
+        keys = self.keys_by_name.get(name)
+        return self.items[next(iter(keys))] if keys else None
+
+    def take(self, name: str) -> Item:
+        """Removes the first item named name from the pool and returns it"""
+        keys = self.keys_by_name.get(name)
+        if not keys:
+            raise ValueError(f"There's no {name} in the item pool")
+        return self._discard(next(iter(keys)))
+
+    def take_category(self, category: str) -> Item:
+        """Removes the first item of category from the pool and returns it"""
+        keys = self.keys_by_category.get(category)
+        if not keys:
+            raise ValueError(f"There's no item of {category} in the item pool")
+        return self._discard(next(iter(keys)))
+
+    def named(self, names: Iterable[str]) -> list[Item]:
+        """Returns the items with any of the names, in pool order"""
+        keys = sorted(key for name in dict.fromkeys(names) for key in self.keys_by_name.get(name, ()))
+        return [self.items[key] for key in keys]
+
+    def in_categories(self, categories: Iterable[str]) -> list[Item]:
+        """Returns the items in any of the categories, in pool order"""
+        keys = sorted({key for category in categories for key in self.keys_by_category.get(category, ())})
+        return [self.items[key] for key in keys]
+
+    def shuffle(self, random: Random):
+        """Shuffles the order of the pool, like random.shuffle on the list"""
+        items = self.to_list()
+        random.shuffle(items)
+        self._rebuild(items)
+
+    def to_list(self) -> list[Item]:
+        return list(self.items.values())
+
+def as_item_pool(items: Iterable[Item]) -> ItemPool:
+    """Returns items as an ItemPool, for the pools the hooks return, which may be lists"""
+    return items if isinstance(items, ItemPool) else ItemPool(items)
+
+def remove_from_item_list(items: list[Item], removed: Iterable[Item]):
+    """Removes each of removed from the list in one pass, leaving it as if list.remove was called for each of them"""
+    counts = Counter((item.name, item.player) for item in removed)
+    if not counts:
+        return
+    kept = []
+    for item in items:
+        key = (item.name, item.player)
+        if counts.get(key):
+            counts[key] -= 1
+        else:
+            kept.append(item)
+    items[:] = kept
@@ -1,6 +1,9 @@
+from typing import NamedTuple
+
 from BaseClasses import Location
 from .Data import location_table
 from .Game import starting_index
+from .Items import item_name_to_item
 
 
 ######################
@@ -57,6 +60,73 @@ for item in location_table:
 # location_id_to_name[None] = "__Manual Game Complete__"
 location_name_to_id = {name: id for id, name in location_id_to_name.items()}
 
+######################
+# Generate location placement tables
+######################
+
+class LocationPlacement(NamedTuple):
+    """The place_item(_category) and dont_place_item(_category) of a location, resolved to item names"""
+    eligible_item_names: tuple[str, ...]  # without the forbidden ones
+    forbidden_item_names: frozenset[str]
+    place_messages: tuple[str, ...]
+    forbid_messages: tuple[str, ...]
+
+def get_category_item_names(categories: list[str]) -> list[str]:
+    """Returns the names of the items in any of the categories, in item order"""
+    return [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(categories)]
+
+def build_location_forbidden_item_names() -> dict[str, frozenset[str]]:
+    """Returns the items forbidden at each location with dont_place_item or dont_place_item_category"""
+    forbidden = {}
+    for location in location_name_to_location.values():
+        forbidden_item_names = []
+        if location.get("dont_place_item"):
+            forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if i["name"] in location["dont_place_item"]])
+
+        if location.get("dont_place_item_category"):
+            forbidden_item_names.extend(get_category_item_names(location["dont_place_item_category"]))
+
+        if forbidden_item_names:
+            forbidden[location["name"]] = frozenset(forbidden_item_names)
+    return forbidden
+
+def build_location_placements() -> dict[str, LocationPlacement]:
+    """Returns the items that can be placed at each location with place_item or place_item_category"""
+    placements = {}
+    for location in location_name_to_location.values():
+        if "place_item" not in location and "place_item_category" not in location:
+            continue
+
+        eligible_item_names = []
+        forbidden_item_names = []
+        place_messages = []
+        forbid_messages = []
+
+        if location.get("place_item"):
+            eligible_item_names += location["place_item"]
+            place_messages.append('", "'.join(location["place_item"]))
+
+        if location.get("place_item_category"):
+            eligible_item_names += get_category_item_names(location["place_item_category"])
+            place_messages.append('", "'.join(location["place_item_category"]) + " category(ies)")
+
+        if location.get("dont_place_item"):
+            forbidden_item_names += location["dont_place_item"]
+            forbid_messages.append('", "'.join(location["dont_place_item"]) + ' items')
+
+        if location.get("dont_place_item_category"):
+            forbidden_item_names += get_category_item_names(location["dont_place_item_category"])
+            forbid_messages.append('", "'.join(location["dont_place_item_category"]) + ' category(ies)')
+
+        placements[location["name"]] = LocationPlacement(
+            tuple(dict.fromkeys(name for name in eligible_item_names if name not in forbidden_item_names)),
+            frozenset(forbidden_item_names), tuple(place_messages), tuple(forbid_messages))
+    return placements
+
+# built once from locations.json, instead of for every player
+location_forbidden_item_names: dict[str, frozenset[str]] = build_location_forbidden_item_names()
+location_placements: dict[str, LocationPlacement] = build_location_placements()
+
 ######################
 # Location classes
 ######################
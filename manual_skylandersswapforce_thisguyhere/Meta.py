@@ -72,3 +72,6 @@ world_description: str = set_world_description("""
 world_webworld: ManualWeb = set_world_webworld(ManualWeb())
 
 enable_region_diagram = bool(meta_table.get("enable_region_diagram", False))
+# "enable_rules_profiler": true in meta.json counts the calls and time of every location, entrance and region rule and
+# requires function during generation, written to a json file next to the output (see Rules.write_rules_profile)
+enable_rules_profiler = bool(meta_table.get("enable_rules_profiler", False))
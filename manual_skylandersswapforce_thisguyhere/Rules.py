@@ -1,15 +1,25 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, NamedTuple, Optional
 from worlds.generic.Rules import set_rule
 from .Regions import regionMap
+from .Data import location_table
+from .Items import category_item_names, item_category_names
 from .hooks import Rules
 from BaseClasses import MultiWorld, CollectionState
-from .Helpers import clamp, is_item_enabled, get_items_with_value, is_option_enabled
+from Options import PerGameCommonOptions
+from .Meta import enable_rules_profiler
+from .Helpers import clamp, is_item_enabled, get_items_with_value, is_option_enabled, state_independent, depends_on_state, \
+    get_requires_function_caching, requires_function_caching, REQUIRES_STATE_INDEPENDENT, REQUIRES_ITEMS, REQUIRES_STATE, REQUIRES_DYNAMIC
 from worlds.AutoWorld import World
 
 import re
 import math
+import json
+import hashlib
 import inspect
 import logging
+import time
+from functools import wraps
+from weakref import WeakKeyDictionary
 
 if TYPE_CHECKING:
     from . import ManualWorld
@@ -67,281 +77,1608 @@ def evaluate_postfix(expr: str, location: str) -> bool:
         raise KeyError("Invalid logic format for location/region {}.".format(location))
     return stack.pop()
 
-def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
-    # this is only called when the area (think, location or region) has a "requires" field that is a string
-    def checkRequireStringForArea(state: CollectionState, area: dict):
-        requires_list = area["requires"]
+# this is only called when the area (think, location or region) has a "requires" field that is a string
+def checkRequireStringForArea(world: "ManualWorld", multiworld: MultiWorld, state: CollectionState, player: int, area: dict):
+    requires_list = area["requires"]
 
-        # Get the "real" item counts of item in the pool/placed/starting_items
-        items_counts = world.get_item_counts(player)
+    # Get the "real" item counts of item in the pool/placed/starting_items
+    items_counts = world.get_item_counts(player)
 
-        if requires_list == "":
-            return True
+    if requires_list == "":
+        return True
 
-        for item in re.findall(r'\{(\w+)\((.*?)\)\}', requires_list):
-            func_name = item[0]
-            func_args = item[1].split(",")
-            if func_args == ['']:
-                func_args.pop()
+    for item in re.findall(r'\{(\w+)\((.*?)\)\}', requires_list):
+        func_name = item[0]
+        func = get_requires_function(func_name)
 
-            func = globals().get(func_name)
+        if not callable(func):
+            raise ValueError(f"Invalid function `{func_name}` in {area}.")
 
-            if func is None:
-                func = getattr(Rules, func_name, None)
+        func_args = get_requires_function_args(func, item[1], area.get("name", f"An area with these parameters: {area}"))
+        result = func(world, multiworld, state, player, *func_args)
+        if isinstance(result, bool):
+            requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", "1" if result else "0")
+        else:
+            requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", str(result))
 
-            if not callable(func):
-                raise ValueError(f"Invalid function `{func_name}` in {area}.")
 
-            convert_req_function_args(func, func_args, area.get("name", f"An area with these parameters: {area}"))
-            result = func(world, multiworld, state, player, *func_args)
-            if isinstance(result, bool):
-                requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", "1" if result else "0")
-            else:
-                requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", str(result))
+    # parse user written statement into list of each item
+    for item in re.findall(r'\|[^|]+\|', requires_list):
+        require_type = 'item'
 
+        if '|@' in item:
+            require_type = 'category'
 
-        # parse user written statement into list of each item
-        for item in re.findall(r'\|[^|]+\|', requires_list):
-            require_type = 'item'
+        item_base = item
+        item = item.lstrip('|@$').rstrip('|')
 
-            if '|@' in item:
-                require_type = 'category'
+        item_parts = item.split(":")  # type: list[str]
+        item_name = item
+        item_count = "1"
 
-            item_base = item
-            item = item.lstrip('|@$').rstrip('|')
 
-            item_parts = item.split(":")  # type: list[str]
-            item_name = item
-            item_count = "1"
+        if len(item_parts) > 1:
+            item_name = item_parts[0].strip()
+            item_count = item_parts[1].strip()
 
+        total = 0
 
-            if len(item_parts) > 1:
-                item_name = item_parts[0].strip()
-                item_count = item_parts[1].strip()
-
-            total = 0
-
-            if require_type == 'category':
-                category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-                category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
-                if item_count.lower() == 'all':
-                    item_count = category_items_counts
-                elif item_count.lower() == 'half':
-                    item_count = int(category_items_counts / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(category_items_counts * percent)
-                else:
-                    try:
-                        item_count = int(item_count)
-                    except ValueError as e:
-                        raise ValueError(f"Invalid item count `{item_name}` in {area}.") from e
-
-                for category_item in category_items:
-                    total += state.count(category_item["name"], player)
-
-                    if total >= item_count:
-                        requires_list = requires_list.replace(item_base, "1")
-            elif require_type == 'item':
-                item_current_count = items_counts.get(item_name, 0)
-                if item_count.lower() == 'all':
-                    item_count = item_current_count
-                elif item_count.lower() == 'half':
-                    item_count = int(item_current_count / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(item_current_count * percent)
-                else:
+        if require_type == 'category':
+            category_items = category_item_names.get(item_name, ())
+            category_items_counts = world.get_category_counts(player).get(item_name, 0)
+            if item_count.lower() == 'all':
+                item_count = category_items_counts
+            elif item_count.lower() == 'half':
+                item_count = int(category_items_counts / 2)
+            elif item_count.endswith('%') and len(item_count) > 1:
+                percent = clamp(float(item_count[:-1]) / 100, 0, 1)
+                item_count = math.ceil(category_items_counts * percent)
+            else:
+                try:
                     item_count = int(item_count)
+                except ValueError as e:
+                    raise ValueError(f"Invalid item count `{item_name}` in {area}.") from e
 
-                total = state.count(item_name, player)
+            for category_item in category_items:
+                total += state.count(category_item, player)
 
                 if total >= item_count:
                     requires_list = requires_list.replace(item_base, "1")
+        elif require_type == 'item':
+            item_current_count = items_counts.get(item_name, 0)
+            if item_count.lower() == 'all':
+                item_count = item_current_count
+            elif item_count.lower() == 'half':
+                item_count = int(item_current_count / 2)
+            elif item_count.endswith('%') and len(item_count) > 1:
+                percent = clamp(float(item_count[:-1]) / 100, 0, 1)
+                item_count = math.ceil(item_current_count * percent)
+            else:
+                item_count = int(item_count)
 
-            if total <= item_count:
-                requires_list = requires_list.replace(item_base, "0")
+            total = state.count(item_name, player)
 
-        requires_list = re.sub(r'\s?\bAND\b\s?', '&', requires_list, 0, re.IGNORECASE)
-        requires_list = re.sub(r'\s?\bOR\b\s?', '|', requires_list, 0, re.IGNORECASE)
+            if total >= item_count:
+                requires_list = requires_list.replace(item_base, "1")
 
-        requires_string = infix_to_postfix("".join(requires_list), area)
-        return (evaluate_postfix(requires_string, area))
+        if total <= item_count:
+            requires_list = requires_list.replace(item_base, "0")
 
-    # this is only called when the area (think, location or region) has a "requires" field that is a dict
-    def checkRequireDictForArea(state: CollectionState, area: dict):
-        canAccess = True
+    requires_list = re.sub(r'\s?\bAND\b\s?', '&', requires_list, 0, re.IGNORECASE)
+    requires_list = re.sub(r'\s?\bOR\b\s?', '|', requires_list, 0, re.IGNORECASE)
 
-        for item in area["requires"]:
-            # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
-            if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
-                canAccessOr = True
-                or_items = item
+    requires_string = infix_to_postfix("".join(requires_list), area)
+    return (evaluate_postfix(requires_string, area))
 
-                if isinstance(item, dict):
-                    or_items = item["or"]
+# this is only called when the area (think, location or region) has a "requires" field that is a dict
+def checkRequireDictForArea(state: CollectionState, player: int, area: dict):
+    canAccess = True
 
-                for or_item in or_items:
-                    or_item_parts = or_item.split(":")
-                    or_item_name = or_item
-                    or_item_count = 1
+    for item in area["requires"]:
+        # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
+        if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
+            canAccessOr = True
+            or_items = item
 
-                    if len(or_item_parts) > 1:
-                        or_item_name = or_item_parts[0]
-                        or_item_count = int(or_item_parts[1])
+            if isinstance(item, dict):
+                or_items = item["or"]
 
-                    if not state.has(or_item_name, player, or_item_count):
-                        canAccessOr = False
+            for or_item in or_items:
+                or_item_parts = or_item.split(":")
+                or_item_name = or_item
+                or_item_count = 1
 
-                if canAccessOr:
-                    canAccess = True
-                    break
+                if len(or_item_parts) > 1:
+                    or_item_name = or_item_parts[0]
+                    or_item_count = int(or_item_parts[1])
+
+                if not state.has(or_item_name, player, or_item_count):
+                    canAccessOr = False
+
+            if canAccessOr:
+                canAccess = True
+                break
+        else:
+            item_parts = item.split(":")
+            item_name = item
+            item_count = 1
+
+            if len(item_parts) > 1:
+                item_name = item_parts[0]
+                item_count = int(item_parts[1])
+
+            if not state.has(item_name, player, item_count):
+                canAccess = False
+
+    return canAccess
+
+# handle any type of checking needed, then ferry the check off to a dedicated method for that check
+# this is the reference (uncompiled) evaluation, the compiled rules below fall back to it for anything they can't handle
+def fullLocationOrRegionCheck(state: CollectionState, player: int, area: dict):
+    # if it's not a usable object of some sort, default to true
+    if not area:
+        return True
+
+    # don't require the "requires" key for locations and regions if they don't need to use it
+    if "requires" not in area.keys():
+        return True
+
+    if isinstance(area["requires"], str):
+        world = state.multiworld.worlds[player]
+        return checkRequireStringForArea(world, world.multiworld, state, player, area)
+    else:  # item access is in dict form
+        return checkRequireDictForArea(state, player, area)
+
+def convert_req_function_args(func, args: list[str], areaName: str, warn: bool = False):
+    parameters = inspect.signature(func).parameters
+    knownArguments = ["world", "multiworld", "state", "player"]
+    index = 0
+    for parameter, info in parameters.items():
+        if parameter in knownArguments:
+            continue
+
+        argType = info.annotation
+        optional = False
+        try:
+            if issubclass(argType, inspect._empty): #if not set then it wont get converted but still be checked for valid data at index
+                argType = str
+
+        except TypeError: # Optional
+            if argType.__module__ == 'typing' and argType._name == 'Optional':
+                optional = True
+                argType = argType.__args__[0]
             else:
-                item_parts = item.split(":")
-                item_name = item
-                item_count = 1
+                #Implementing complex typing is not simple so ill skip it for now
+                index += 1
+                continue
 
-                if len(item_parts) > 1:
-                    item_name = item_parts[0]
-                    item_count = int(item_parts[1])
+        try:
+            value = args[index].strip()
 
-                if not state.has(item_name, player, item_count):
-                    canAccess = False
+        except IndexError:
+            if info is not inspect.Parameter.empty:
+                value = info.default
 
-        return canAccess
+            else:
+                raise Exception(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but its missing")
 
-    # handle any type of checking needed, then ferry the check off to a dedicated method for that check
-    def fullLocationOrRegionCheck(state: CollectionState, area: dict):
-        # if it's not a usable object of some sort, default to true
-        if not area:
-            return True
+        if optional:
+            if isinstance(value, type(None)):
+                index += 1
+                continue
+            elif isinstance(value, str):
+                if value.lower() == 'none':
+                    value = None
+                    args[index] = value
+                    index += 1
+                    continue
 
-        # don't require the "requires" key for locations and regions if they don't need to use it
-        if "requires" not in area.keys():
-            return True
 
-        if isinstance(area["requires"], str):
-            return checkRequireStringForArea(state, area)
-        else:  # item access is in dict form
-            return checkRequireDictForArea(state, area)
+        if not isinstance(value, argType):
+            if issubclass(argType, bool):
+                #Special conversion to bool
+                if value.lower() in ['true', '1']:
+                    value = True
 
-    used_location_names = []
-    # Region access rules
-    for region in regionMap.keys():
-        used_location_names.extend([l.name for l in multiworld.get_region(region, player).locations])
-        if region != "Menu":
-            for exitRegion in multiworld.get_region(region, player).exits:
-                def fullRegionCheck(state: CollectionState, region=regionMap[region]):
-                    return fullLocationOrRegionCheck(state, region)
+                elif value.lower() in ['false', '0']:
+                    value = False
 
-                set_rule(multiworld.get_entrance(exitRegion.name, player), fullRegionCheck)
+                else:
+                    value = bool(value)
+                    if warn:
+                    # warning here spam the console if called from rules.py, might be worth to make it a data validation instead
+                        logging.warn(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but an unknown string was passed and thus converted to {value}")
 
-    # Location access rules
-    for location in world.location_table:
-        if location["name"] not in used_location_names:
-            continue
+            else:
+                try:
+                    value = argType(value)
+
+                except ValueError:
+                    raise Exception(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but its value '{value}' cannot be converted to {argType}")
+
+            args[index] = value
+
+        index += 1
+
+# Looking up a {Function()} and converting its arguments only depends on its name and raw arguments,
+# so both are done once and reused by every requires calling it.
+_requires_functions = {}
+_requires_function_args = {}
+
+def get_requires_function(func_name: str):
+    """Returns the function a requires calls as {func_name()}, from this file first then from hooks/Rules.py."""
+    func = _requires_functions.get(func_name)
+    if func is None:
+        func = globals().get(func_name)
+        if func is None:
+            func = getattr(Rules, func_name, None)
+        if callable(func):
+            if enable_rules_profiler:
+                func = profile_requires_function(func)
+            _requires_functions[func_name] = func
+    return func
+
+def get_requires_function_args(func, raw_args: str, areaName: str) -> tuple:
+    """Returns the arguments of a {Function(raw_args)} call, converted to the types func asks for."""
+    key = (func, raw_args)
+    args = _requires_function_args.get(key)
+    if args is None:
+        func_args = raw_args.split(",")
+        if func_args == ['']:
+            func_args.pop()
+        convert_req_function_args(func, func_args, areaName)
+        args = _requires_function_args[key] = tuple(func_args)
+    return args
+
+
+######################
+# Requires compiler
+######################
+#
+# String requires are parsed once, when rules are set, into a small tree of nodes that only calls state.count/state.has.
+# The trees reproduce checkRequireStringForArea exactly: AND and OR share the same precedence and are applied left to right,
+# and "!" binds to the operand right after it. {Function()} calls are operands of the tree as long as they return a bool,
+# the first time one returns a string the rule switches to substituting the results in the string, like before, but with
+# every substituted string only parsed once.
+# Once parsed, AND/OR runs become RequiresAll/RequiresAny nodes that stop at the first false/true operand, trying the
+# cheapest operands first. Since a function returning a string could change the operators around its call, that only
+# happens when every function of the requires is annotated as returning a bool, otherwise every operand is evaluated.
+# Functions decorated with @state_independent (YamlEnabled, OptOne, ...) are called once when compiling instead, their
+# results replaced in the string before it's parsed, and again only if the player's item counts are reset.
+# Dict/list form requires become a RequiresClauses, their "Item:count" strings split once.
+# Anything the compiler isn't sure it reproduces exactly (stray text, odd digits, malformed brackets, ...) is left to
+# fullLocationOrRegionCheck instead, so it keeps behaving (and raising) exactly like before.
+
+REQUIRES_AND = "&"
+REQUIRES_OR = "|"
+
+# functions are swapped for a single private use character before the items are parsed, like their 1/0 result would be
+_requires_function_regex = re.compile(r'\{(\w+)\((.*?)\)\}')
+_requires_placeholder_base = 0xE000
+_requires_placeholder_regex = re.compile(r'[\ue000-\uf8ff]')
+_requires_token_regex = re.compile(r'(\|[^|]+\|)|(\s+)|([\ue000-\uf8ff])|(\w+)|(.)', re.DOTALL)
+
+class RequiresFallback(Exception):
+    """Raised when a requires string can't be compiled faithfully, or when a {Function()} returned something else than a bool."""
+    pass
+
+class RequiresConst:
+    """A constant operand, like a literal 0 or 1 or a category without any item in it."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool):
+        self.value = value
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return self.value
+
+    def cost(self) -> int:
+        return 0
+
+class RequiresItem:
+    """|Item:count|, an 'all', 'half' or 'N%' count is kept in relative and resolved to an int once per player."""
+    __slots__ = ("name", "count", "relative")
+
+    def __init__(self, name: str, count: int, relative: Optional[str] = None):
+        self.name = name
+        self.count = count
+        self.relative = relative
+
+    def resolve(self, world: "ManualWorld", player: int):
+        self.count = resolve_requires_count(self.relative, world.get_item_counts(player).get(self.name, 0))
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return state.count(self.name, player) >= self.count
+
+    def cost(self) -> int:
+        return 1
+
+class RequiresCategory:
+    """|@Category:count|, same counts as RequiresItem but summed over every item of the category."""
+    __slots__ = ("name", "items", "count", "relative")
+
+    def __init__(self, name: str, items: tuple[str, ...], count: int, relative: Optional[str] = None):
+        self.name = name
+        self.items = items
+        self.count = count
+        self.relative = relative
+
+    def resolve(self, world: "ManualWorld", player: int):
+        self.count = resolve_requires_count(self.relative, world.get_category_counts(player).get(self.name, 0))
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return get_collected_category_count(state.multiworld.worlds[player], state, self.name) >= self.count
+
+    def cost(self) -> int:
+        # a lookup in the per-state category counts
+        return 2
+
+class RequiresNot:
+    """!operand"""
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return not self.operand.evaluate(state, player)
+
+    def cost(self) -> int:
+        return self.operand.cost()
+
+class RequiresFunction:
+    """{Function(args)}, with the function looked up and its arguments converted once,
+    its results reused as long as the function's decorator allows (see Helpers.get_requires_function_caching)."""
+    __slots__ = ("text", "func", "args", "returns_bool", "caching")
+
+    def __init__(self, text: str, func, args: tuple):
+        self.text = text
+        self.func = func
+        self.args = args
+        self.returns_bool = inspect.signature(func).return_annotation in [bool, "bool"]
+        self.caching = get_requires_function_caching(func)
+
+    def call(self, state: CollectionState, player: int):
+        world = state.multiworld.worlds[player]
+        kind = self.caching.kind
+        if kind == REQUIRES_DYNAMIC:
+            return self.func(world, world.multiworld, state, player, *self.args)
+
+        if kind == REQUIRES_STATE or kind == REQUIRES_ITEMS:
+            # kept with the state, so the results go away with it
+            cache = get_requires_state_cache(world, state)
+            if kind == REQUIRES_STATE:
+                version = (cache.stamp, len(state.reachable_regions[player]))
+            else:
+                version = tuple([state.count(name, player) for name in self.caching.items])
+            result = cache.functions.get(self.text)
+            if result is None or result[0] != version:
+                result = cache.functions[self.text] = (version, self.func(world, world.multiworld, state, player, *self.args))
+            return result[1]
+
+        results = world.requires_function_results
+        if self.text not in results:
+            results[self.text] = self.func(world, world.multiworld, state, player, *self.args)
+        return results[self.text]
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        result = self.call(state, player)
+        if not isinstance(result, bool):
+            raise RequiresFallback(f"{self.text} didn't return a bool")
+        return result
+
+    def cost(self) -> int:
+        # we can't know what a function does, assume it's a lot more than counting items
+        return 25
+
+class RequiresSequence:
+    """operand (op operand)*, folded from left to right like evaluate_postfix does."""
+    __slots__ = ("first", "rest")
+
+    def __init__(self, first, rest: tuple):
+        self.first = first
+        self.rest = rest
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        value = self.first.evaluate(state, player)
+        for op, operand in self.rest:
+            operand_value = operand.evaluate(state, player)
+            if op == REQUIRES_AND:
+                value = value and operand_value
+            else:
+                value = value or operand_value
+        return value
 
-        locFromWorld = multiworld.get_location(location["name"], player)
+    def cost(self) -> int:
+        return self.first.cost() + sum(operand.cost() for _, operand in self.rest)
 
-        locationRegion = regionMap[location["region"]] if "region" in location else None
+class RequiresAll:
+    """operand AND operand AND ..., stops at the first false operand."""
+    __slots__ = ("operands",)
 
-        if "requires" in location: # Location has requires, check them alongside the region requires
-            def checkBothLocationAndRegion(state: CollectionState, location=location, region=locationRegion):
-                locationCheck = fullLocationOrRegionCheck(state, location)
-                regionCheck = True # default to true unless there's a region with requires
+    def __init__(self, operands: tuple):
+        self.operands = operands
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        for operand in self.operands:
+            if not operand.evaluate(state, player):
+                return False
+        return True
 
-                if region:
-                    regionCheck = fullLocationOrRegionCheck(state, region)
+    def cost(self) -> int:
+        return sum(operand.cost() for operand in self.operands)
 
-                return locationCheck and regionCheck
+class RequiresAny:
+    """operand OR operand OR ..., stops at the first true operand."""
+    __slots__ = ("operands",)
 
-            set_rule(locFromWorld, checkBothLocationAndRegion)
-        elif "region" in location: # Only region access required, check the location's region's requires
-            def fullRegionCheck(state, region=locationRegion):
-                return fullLocationOrRegionCheck(state, region)
+    def __init__(self, operands: tuple):
+        self.operands = operands
 
-            set_rule(locFromWorld, fullRegionCheck)
-        else: # No location region and no location requires? It's accessible.
-            def allRegionsAccessible(state):
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        for operand in self.operands:
+            if operand.evaluate(state, player):
                 return True
+        return False
 
-            set_rule(locFromWorld, allRegionsAccessible)
+    def cost(self) -> int:
+        return sum(operand.cost() for operand in self.operands)
 
-    # Victory requirement
-    multiworld.completion_condition[player] = lambda state: state.has("__Victory__", player)
+class RequiresClauses:
+    """Dict/list form requires, with the "Item:count" strings split once: true if any "or" group has all its items,
+    otherwise if every other item is had, like checkRequireDictForArea."""
+    __slots__ = ("items", "groups")
 
-    def convert_req_function_args(func, args: list[str], areaName: str, warn: bool = False):
-        parameters = inspect.signature(func).parameters
-        knownArguments = ["world", "multiworld", "state", "player"]
-        index = 0
-        for parameter, info in parameters.items():
-            if parameter in knownArguments:
-                continue
+    def __init__(self, items: tuple[tuple[str, int], ...], groups: tuple[tuple[tuple[str, int], ...], ...]):
+        self.items = items
+        self.groups = groups
 
-            argType = info.annotation
-            optional = False
-            try:
-                if issubclass(argType, inspect._empty): #if not set then it wont get converted but still be checked for valid data at index
-                    argType = str
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        for group in self.groups:
+            for name, count in group:
+                if not state.has(name, player, count):
+                    break
+            else:
+                return True
+        for name, count in self.items:
+            if not state.has(name, player, count):
+                return False
+        return True
 
-            except TypeError: # Optional
-                if argType.__module__ == 'typing' and argType._name == 'Optional':
-                    optional = True
-                    argType = argType.__args__[0]
-                else:
-                    #Implementing complex typing is not simple so ill skip it for now
-                    index += 1
-                    continue
+    def cost(self) -> int:
+        return len(self.items) + sum(len(group) for group in self.groups)
+
+class RequiresReference:
+    """Evaluates the area with fullLocationOrRegionCheck, for requires the compiler doesn't handle."""
+    __slots__ = ("area",)
+
+    def __init__(self, area: dict):
+        self.area = area
 
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return fullLocationOrRegionCheck(state, player, self.area)
+
+    def cost(self) -> int:
+        return 100
+
+class RequiresSubstitution:
+    """Substitutes the {Function()} results in the requires string like checkRequireStringForArea does,
+    then evaluates the resulting string, parsed once per distinct result."""
+    __slots__ = ("area", "calls", "parsed")
+
+    def __init__(self, area: dict, calls: tuple):
+        self.area = area
+        self.calls = calls
+        self.parsed = {}
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        requires = self.area["requires"]
+        for call in self.calls:
+            result = call.call(state, player)
+            if isinstance(result, bool):
+                requires = requires.replace(call.text, "1" if result else "0")
+            else:
+                requires = requires.replace(call.text, str(result))
+
+        node = self.parsed.get(requires)
+        if node is None:
             try:
-                value = args[index].strip()
+                node = short_circuit_requires(parse_substituted_requires(requires))
+                bind_relative_requires(node, state.multiworld.worlds[player], player)
+            except RequiresFallback:
+                node = RequiresReference(self.area)
+            self.parsed[requires] = node
+        return node.evaluate(state, player)
+
+class RequiresRule:
+    """The compiled "requires" of a location or region, usable directly as an access rule."""
+    __slots__ = ("area", "player", "node", "substitution", "implied")
+
+    def __init__(self, area: dict, player: int, node, substitution: Optional[RequiresSubstitution] = None,
+                 implied: Optional["RequiresRule"] = None):
+        self.area = area
+        self.player = player
+        self.node = node
+        self.substitution = substitution
+        # a rule that's always checked along with this one, like the region of a location
+        self.implied = implied
+
+    def __call__(self, state: CollectionState) -> bool:
+        try:
+            return self.node.evaluate(state, self.player)
+        except RequiresFallback:
+            # a function returned a string (or a number), from now on substitute the results like checkRequireStringForArea
+            self.node = self.substitution
+            return self.node.evaluate(state, self.player)
+
+def resolve_requires_count(count: str, available: int) -> int:
+    """Resolves an 'all', 'half' or 'N%' requires count against the number of items available"""
+    if count.lower() == 'all':
+        return available
+    if count.lower() == 'half':
+        return int(available / 2)
+    percent = clamp(float(count[:-1]) / 100, 0, 1)
+    return math.ceil(available * percent)
+
+def _parse_requires_term(item: str):
+    require_type = 'category' if '|@' in item else 'item'
 
-            except IndexError:
-                if info is not inspect.Parameter.empty:
-                    value = info.default
+    item = item.lstrip('|@$').rstrip('|')
+    item_parts = item.split(":")
+    item_name = item
+    item_count = "1"
 
-                else:
-                    raise Exception(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but its missing")
+    if len(item_parts) > 1:
+        item_name = item_parts[0].strip()
+        item_count = item_parts[1].strip()
+
+    relative = None
+    if item_count.lower() in ['all', 'half'] or (item_count.endswith('%') and len(item_count) > 1):
+        try:
+            if item_count.endswith('%'):
+                float(item_count[:-1])
+        except ValueError as e:
+            raise RequiresFallback(f"Invalid item count `{item_count}`") from e
+        relative = item_count
+        item_count = 0
+    else:
+        try:
+            item_count = int(item_count)
+        except ValueError as e:
+            raise RequiresFallback(f"Invalid item count `{item_count}`") from e
 
-            if optional:
-                if isinstance(value, type(None)):
-                    index += 1
+    if require_type == 'category':
+        category_items = category_item_names.get(item_name, ())
+        if not category_items:
+            # an empty category is never satisfied, whatever the count
+            return RequiresConst(False)
+        return RequiresCategory(item_name, category_items, item_count, relative)
+    return RequiresItem(item_name, item_count, relative)
+
+def _tokenize_requires(requires: str, functions: tuple) -> list[tuple]:
+    tokens = []
+    for match in _requires_token_regex.finditer(requires):
+        item, space, placeholder, word, char = match.groups()
+        if item is not None:
+            if _requires_placeholder_regex.search(item):
+                raise RequiresFallback("Function inside an item")
+            tokens.append(("value", _parse_requires_term(item), match.start(), match.end()))
+        elif space is not None:
+            continue
+        elif placeholder is not None:
+            index = ord(placeholder) - _requires_placeholder_base
+            if index >= len(functions):
+                raise RequiresFallback(f"Unexpected `{placeholder}`")
+            tokens.append(("value", functions[index], match.start(), match.end()))
+        elif word is not None:
+            if word.lower() == "and":
+                tokens.append(("op", REQUIRES_AND, match.start(), match.end()))
+            elif word.lower() == "or":
+                tokens.append(("op", REQUIRES_OR, match.start(), match.end()))
+            elif word == "0" or word == "1":
+                tokens.append(("value", RequiresConst(word == "1"), match.start(), match.end()))
+            else:
+                raise RequiresFallback(f"Unexpected `{word}`")
+        elif char in "&|":
+            tokens.append(("op", char, match.start(), match.end()))
+        elif char in "!()":
+            tokens.append((char, None, match.start(), match.end()))
+        else:
+            raise RequiresFallback(f"Unexpected `{char}`")
+
+    # AND/OR are only replaced when they are whole words, which they aren't once the item next to them became a 0 or 1
+    for index, (kind, _, start, end) in enumerate(tokens):
+        if kind != "op" or end - start == 1:
+            continue
+        if index > 0 and tokens[index - 1][0] == "value" and tokens[index - 1][3] == start:
+            raise RequiresFallback("AND/OR next to an operand")
+        if index + 1 < len(tokens) and tokens[index + 1][0] == "value" and tokens[index + 1][2] == end:
+            raise RequiresFallback("AND/OR next to an operand")
+
+    return tokens
+
+def _parse_requires_group(tokens: list[tuple], index: int, depth: int) -> tuple:
+    terms = []
+    op = None
+    while True:
+        negate = False
+        if index < len(tokens) and tokens[index][0] == "!":
+            negate = True
+            index += 1
+
+        if index >= len(tokens):
+            raise RequiresFallback("Missing operand")
+        kind, value = tokens[index][0], tokens[index][1]
+        if kind == "(":
+            operand, index = _parse_requires_group(tokens, index + 1, depth + 1)
+        elif kind == "value":
+            operand = value
+            index += 1
+        else:
+            raise RequiresFallback("Missing operand")
+
+        if negate:
+            operand = RequiresNot(operand)
+        terms.append((op, operand))
+
+        if index >= len(tokens):
+            # unclosed brackets are closed at the end of the string, like infix_to_postfix does
+            return _make_requires_sequence(terms), index
+        kind, value = tokens[index][0], tokens[index][1]
+        if kind == ")":
+            if depth == 0:
+                raise RequiresFallback("Unmatched bracket")
+            return _make_requires_sequence(terms), index + 1
+        if kind != "op":
+            raise RequiresFallback("Missing operator")
+        op = value
+        index += 1
+
+def _make_requires_sequence(terms: list[tuple]):
+    if len(terms) == 1:
+        return terms[0][1]
+    return RequiresSequence(terms[0][1], tuple(terms[1:]))
+
+def _build_requires_function(func_name: str, raw_args: str, area_name: str) -> RequiresFunction:
+    func = get_requires_function(func_name)
+    if not callable(func):
+        raise RequiresFallback(f"Invalid function `{func_name}`")
+
+    try:
+        func_args = get_requires_function_args(func, raw_args, area_name)
+    except Exception as e:
+        raise RequiresFallback(str(e)) from e
+    return RequiresFunction("{" + func_name + "(" + raw_args + ")}", func, func_args)
+
+def parse_requires(requires: str, area_name: str) -> tuple:
+    """Parses a requires string into a tree of Requires* nodes, returns the tree and the function calls in the order
+    checkRequireStringForArea makes them. Raises RequiresFallback if it can't be done faithfully."""
+    if requires == "":
+        return RequiresConst(True), ()
+
+    if _requires_placeholder_regex.search(requires):
+        raise RequiresFallback("Unexpected private use character")
+
+    calls = []
+    functions = {}
+    template = requires
+    for func_name, raw_args in _requires_function_regex.findall(requires):
+        call = _build_requires_function(func_name, raw_args, area_name)
+        calls.append(call)
+        if call.text in functions or call.text not in template:
+            continue
+        if _requires_placeholder_base + len(functions) > 0xF8FF:
+            raise RequiresFallback("Too many functions")
+        template = template.replace(call.text, chr(_requires_placeholder_base + len(functions)))
+        functions[call.text] = call
+
+    tokens = _tokenize_requires(template, tuple(functions.values()))
+    node, _ = _parse_requires_group(tokens, 0, 0)
+    return node, tuple(calls)
+
+def _parse_requires_clause(item) -> tuple[str, int]:
+    if not isinstance(item, str):
+        raise RequiresFallback(f"Unexpected requires item {item!r}")
+    item_parts = item.split(":")
+    if len(item_parts) > 1:
+        try:
+            return item_parts[0], int(item_parts[1])
+        except ValueError as e:
+            raise RequiresFallback(str(e)) from e
+    return item, 1
+
+def parse_requires_clauses(requires) -> RequiresClauses:
+    """Splits dict/list form requires into RequiresClauses.
+    Raises RequiresFallback for anything checkRequireDictForArea would raise on, it's left to it."""
+    items = []
+    groups = []
+    for item in requires:
+        # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
+        if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
+            or_items = item["or"] if isinstance(item, dict) else item
+            groups.append(tuple(_parse_requires_clause(or_item) for or_item in or_items))
+        else:
+            items.append(_parse_requires_clause(item))
+    return RequiresClauses(tuple(items), tuple(groups))
+
+def parse_substituted_requires(requires: str):
+    """Parses a requires string once its {Function()} calls have been substituted"""
+    if _requires_placeholder_regex.search(requires):
+        raise RequiresFallback("Unexpected private use character")
+    tokens = _tokenize_requires(requires, ())
+    node, _ = _parse_requires_group(tokens, 0, 0)
+    return node
+
+def iter_requires_nodes(node):
+    """Yields every node of a compiled requires tree, parents before their operands"""
+    yield node
+    if isinstance(node, RequiresNot):
+        yield from iter_requires_nodes(node.operand)
+    elif isinstance(node, RequiresSequence):
+        yield from iter_requires_nodes(node.first)
+        for _, operand in node.rest:
+            yield from iter_requires_nodes(operand)
+    elif isinstance(node, (RequiresAll, RequiresAny)):
+        for operand in node.operands:
+            yield from iter_requires_nodes(operand)
+
+def bind_relative_requires(node, world: "ManualWorld", player: int):
+    """Resolves the 'all', 'half' and 'N%' counts of a tree for the player"""
+    for subnode in iter_requires_nodes(node):
+        if isinstance(subnode, (RequiresItem, RequiresCategory)) and subnode.relative is not None:
+            subnode.resolve(world, player)
+
+def resolve_relative_requires(world: "ManualWorld"):
+    """Compiles the world's requires again after its item counts changed, their 'all', 'half' and 'N%' counts and
+    state independent function results depend on them. The rules get their own trees, even if they shared them with
+    other players."""
+    for rule in getattr(world, "compiled_requires", []):
+        build_requires_rule(world, rule)
+    # the cached results are outdated
+    world.requires_state_caches.clear()
+    world.requires_function_results.clear()
+
+def short_circuit_requires(node):
+    """Turns the left to right RequiresSequence folds of a tree into RequiresAll/RequiresAny,
+    with the operands of each sorted from the cheapest to the most expensive"""
+    if isinstance(node, RequiresNot):
+        return RequiresNot(short_circuit_requires(node.operand))
+    if not isinstance(node, RequiresSequence):
+        return node
+
+    # ((a AND b) OR c) AND d: each change of operator wraps everything folded so far
+    value = short_circuit_requires(node.first)
+    value_op = None
+    operands = [value]
+    for op, operand in node.rest:
+        if op != value_op and value_op is not None:
+            operands = [_make_requires_junction(value_op, operands)]
+        value_op = op
+        operands.append(short_circuit_requires(operand))
+    return _make_requires_junction(value_op, operands)
+
+def _make_requires_junction(op: str, operands: list):
+    # sorted() is stable, operands of the same cost keep the order they were written in
+    operands = tuple(sorted(operands, key=lambda operand: operand.cost()))
+    if op == REQUIRES_AND:
+        return RequiresAll(operands)
+    return RequiresAny(operands)
+
+def requires_node_key(node) -> tuple:
+    """Returns a key equal for compiled nodes known to be the same requires"""
+    if isinstance(node, RequiresConst):
+        return ("const", node.value)
+    if isinstance(node, RequiresItem):
+        return ("item", node.name, node.count if node.relative is None else node.relative)
+    if isinstance(node, RequiresCategory):
+        return ("category", node.name, node.count if node.relative is None else node.relative)
+    if isinstance(node, RequiresFunction):
+        return ("function", node.text)
+    if isinstance(node, RequiresNot):
+        return ("not", requires_node_key(node.operand))
+    if isinstance(node, RequiresAll):
+        return ("all", frozenset(requires_node_key(operand) for operand in node.operands))
+    if isinstance(node, RequiresAny):
+        return ("any", frozenset(requires_node_key(operand) for operand in node.operands))
+    return ("node", id(node))
+
+def requires_implies(a, b) -> bool:
+    """Is b true whenever a is? False when it can't be told."""
+    if requires_node_key(a) == requires_node_key(b):
+        return True
+    if isinstance(a, RequiresConst) and not a.value or isinstance(b, RequiresConst) and b.value:
+        return True
+    if isinstance(b, RequiresAll):
+        return all(requires_implies(a, operand) for operand in b.operands)
+    if isinstance(a, RequiresAny):
+        return all(requires_implies(operand, b) for operand in a.operands)
+    if isinstance(a, RequiresAll) and any(requires_implies(operand, b) for operand in a.operands):
+        return True
+    if isinstance(b, RequiresAny) and any(requires_implies(a, operand) for operand in b.operands):
+        return True
+    if isinstance(a, RequiresNot) and isinstance(b, RequiresNot):
+        return requires_implies(b.operand, a.operand)
+
+    # at least count of an item is also at least any lower count of it, or of a category it's in
+    if not isinstance(a, (RequiresItem, RequiresCategory)) or not isinstance(b, (RequiresItem, RequiresCategory)):
+        return False
+    if a.relative is not None or b.relative is not None or a.count < b.count:
+        return False
+    if isinstance(b, RequiresCategory):
+        return a.name == b.name if isinstance(a, RequiresCategory) else a.name in b.items
+    return isinstance(a, RequiresItem) and a.name == b.name
+
+def _requires_operands(node, junction: type) -> list:
+    return list(node.operands) if isinstance(node, junction) else [node]
+
+def simplify_requires(node, implied=None):
+    """Simplifies a short circuited tree: constant and count 0 terms are folded, duplicates and terms absorbed by
+    another one removed, and terms common to every operand of a junction factored out.
+    implied is a tree that's true whenever the result of node matters (the region of a location), any term it
+    implies is true."""
+    if implied is not None and requires_implies(implied, node):
+        return RequiresConst(True)
+    if isinstance(node, (RequiresItem, RequiresCategory)) and node.relative is None and node.count <= 0:
+        return RequiresConst(True)
+    if isinstance(node, RequiresNot):
+        operand = simplify_requires(node.operand, implied)
+        if isinstance(operand, RequiresConst):
+            return RequiresConst(not operand.value)
+        if isinstance(operand, RequiresNot):
+            return operand.operand
+        return RequiresNot(operand)
+    if not isinstance(node, (RequiresAll, RequiresAny)):
+        return node
+
+    junction = type(node)
+    is_all = junction is RequiresAll
+    operands = []
+    keys = set()
+    for operand in node.operands:
+        for operand in _requires_operands(simplify_requires(operand, implied), junction):
+            if isinstance(operand, RequiresConst):
+                if operand.value != is_all:
+                    # a false AND / true OR decides everything
+                    return RequiresConst(operand.value)
+                continue
+            key = requires_node_key(operand)
+            if key not in keys:
+                keys.add(key)
+                operands.append(operand)
+
+    # absorption: a AND (a OR b) is a, a OR (a AND b) is a
+    kept = []
+    for i, operand in enumerate(operands):
+        others = kept + operands[i + 1:]
+        if is_all and any(requires_implies(other, operand) for other in others):
+            continue
+        if not is_all and any(requires_implies(operand, other) for other in others):
+            continue
+        kept.append(operand)
+    operands = kept
+
+    # factoring: (a AND b) OR (a AND c) is a AND (b OR c), (a OR b) AND (a OR c) is a OR (b AND c)
+    inner = RequiresAny if is_all else RequiresAll
+    if len(operands) > 1:
+        terms = [_requires_operands(operand, inner) for operand in operands]
+        common = set.intersection(*({requires_node_key(term) for term in operand_terms} for operand_terms in terms))
+        if common:
+            common_terms = [term for term in terms[0] if requires_node_key(term) in common]
+            rests = [[term for term in operand_terms if requires_node_key(term) not in common] for operand_terms in terms]
+            factored = _make_requires_junction(REQUIRES_AND if is_all else REQUIRES_OR,
+                                               [inner(tuple(rest)) if len(rest) != 1 else rest[0] for rest in rests])
+            return simplify_requires(inner(tuple(common_terms) + (factored,)), implied)
+
+    if not operands:
+        return RequiresConst(is_all)
+    if len(operands) == 1:
+        return operands[0]
+    return _make_requires_junction(REQUIRES_AND if is_all else REQUIRES_OR, operands)
+
+def fold_requires_functions(world: "ManualWorld", player: int, area: dict) -> str:
+    """Returns the requires string of area with the calls of state independent functions replaced by their result,
+    like checkRequireStringForArea would. Only the calls before the first one that isn't state independent are replaced,
+    so the remaining ones are still replaced in the same order."""
+    requires = area["requires"]
+    state = None
+    for func_name, raw_args in _requires_function_regex.findall(area["requires"]):
+        func = get_requires_function(func_name)
+        if not callable(func) or get_requires_function_caching(func).kind != REQUIRES_STATE_INDEPENDENT \
+                or "{" in raw_args or "}" in raw_args:
+            break
+        try:
+            func_args = get_requires_function_args(func, raw_args, area.get("name", f"An area with these parameters: {area}"))
+        except Exception:
+            break # let the check raise it
+        if state is None:
+            state = getattr(world.multiworld, "state", None) or CollectionState(world.multiworld)
+        result = func(world, world.multiworld, state, player, *func_args)
+        if isinstance(result, bool):
+            result = "1" if result else "0"
+        else:
+            result = str(result)
+            if "{" in result or "}" in result or _requires_placeholder_regex.search(result):
+                break # it would be parsed as another call
+        requires = requires.replace("{" + func_name + "(" + raw_args + ")}", result)
+    return requires
+
+def build_requires_rule(world: "ManualWorld", rule: RequiresRule):
+    """Compiles the "requires" of rule.area into rule"""
+    area = rule.area
+    rule.node, rule.substitution = RequiresConst(True), None
+    if not area or "requires" not in area.keys():
+        return
+
+    if isinstance(area["requires"], str):
+        requires = fold_requires_functions(world, rule.player, area)
+        if requires != area["requires"]:
+            area = dict(area, requires=requires)
+        builder = get_generated_requires().get(requires)
+        if builder is not None:
+            node, calls = builder(), ()
+        else:
+            try:
+                node, calls = parse_requires(requires, area.get("name", f"An area with these parameters: {area}"))
+            except RequiresFallback:
+                rule.node = RequiresReference(area)
+                return
+        if all(call.returns_bool for call in calls):
+            node = simplify_requires(short_circuit_requires(node), get_implied_requires(rule))
+        bind_relative_requires(node, world, rule.player)
+        rule.node = node
+        rule.substitution = RequiresSubstitution(area, calls) if calls else None
+        return
+
+    # item access is in dict form
+    try:
+        rule.node = parse_requires_clauses(area["requires"])
+    except RequiresFallback:
+        rule.node = RequiresReference(area)
+
+def get_implied_requires(rule: RequiresRule):
+    """Returns the tree of the rule always checked along with rule, if it can be used to simplify it"""
+    implied = rule.implied.node if rule.implied else None
+    if implied is None or any(isinstance(node, (RequiresFunction, RequiresSequence)) for node in iter_requires_nodes(implied)):
+        # function results can't be compared (and could turn out not to be bools)
+        return None
+    return implied
+
+def calls_requires_functions(area: dict) -> bool:
+    """Does the area's requires call {Function()}s"""
+    return isinstance(area.get("requires"), str) and "{" in area["requires"]
+
+def compile_requires(world: "ManualWorld", player: int, area: dict, implied: Optional[RequiresRule] = None,
+                     program: Optional[dict] = None) -> RequiresRule:
+    """Compiles the "requires" of a location or region into an access rule.
+    implied is a rule always checked along with it, like the location's region, terms it implies are dropped.
+    program holds the trees compiled for players with the same requires fingerprint, they're reused if the area has one.
+    Requires with function calls, or implying a rule with some, are always compiled for the player."""
+    rule = RequiresRule(area, player, RequiresConst(True), implied=implied)
+    world.compiled_requires.append(rule)
+    if calls_requires_functions(area) or implied is not None and calls_requires_functions(implied.area):
+        program = None
+    if program is not None and id(area) in program:
+        _, rule.node, rule.substitution = program[id(area)]
+        return rule
+    build_requires_rule(world, rule)
+    if program is not None:
+        # the area is kept along so its id isn't reused
+        program[id(area)] = (area, rule.node, rule.substitution)
+    return rule
+
+######################
+# Shared requires
+######################
+#
+# Besides the requires themselves, the compiled trees only depend on the player through the options and the item
+# counts behind their 'all', 'half' and 'N%' counts, they're evaluated with the player as an argument. So players of a
+# multiworld with the same options and relative counts share them, the requires are only compiled for the first one.
+# Requires calling functions aren't shared, their results can depend on anything of the world. Neither are the requires
+# of the locations whose region calls some, they're simplified against the region's tree the results were folded into.
+# A player whose item counts are reset later compiles its own again.
+
+_requires_programs = WeakKeyDictionary()
+_relative_requires_regex = re.compile(r'\|([@$]*)([^|:]+):([^|]+)\|')
+_relative_requires_names = None
+
+def get_relative_requires_names() -> tuple[frozenset, frozenset]:
+    """Returns the items and the categories the string requires use with an 'all', 'half' or 'N%' count"""
+    global _relative_requires_names
+    if _relative_requires_names is None:
+        items = set()
+        categories = set()
+        for requires in get_string_requires():
+            for prefix, name, count in _relative_requires_regex.findall(requires):
+                count = count.strip().lower()
+                if count in ['all', 'half'] or (count.endswith('%') and len(count) > 1):
+                    (categories if prefix.startswith('@') else items).add(name.strip())
+        _relative_requires_names = frozenset(items), frozenset(categories)
+    return _relative_requires_names
+
+def _requires_fingerprint_value(value):
+    if isinstance(value, dict):
+        return tuple(sorted((repr(key), _requires_fingerprint_value(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_requires_fingerprint_value(item)) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_requires_fingerprint_value(item) for item in value)
+    return value
+
+def get_requires_fingerprint(world: "ManualWorld") -> tuple:
+    """Returns what the compiled requires of the world's player depend on: the value of every option of the game
+    (the options every game has don't change its requires) and the counts of the items and categories used with
+    relative counts"""
+    common_options = PerGameCommonOptions.type_hints
+    options = tuple((name, _requires_fingerprint_value(getattr(world.options, name).value))
+                    for name in sorted(type(world.options).type_hints) if name not in common_options)
+    items, categories = get_relative_requires_names()
+    item_counts = world.get_item_counts(world.player)
+    category_counts = world.get_category_counts(world.player)
+    return (options, tuple((name, item_counts.get(name, 0)) for name in sorted(items)),
+            tuple((name, category_counts.get(name, 0)) for name in sorted(categories)))
+
+def get_requires_program(world: "ManualWorld") -> dict:
+    """Returns the trees compiled so far for the players of the world's multiworld with the same fingerprint"""
+    programs = _requires_programs.setdefault(world.multiworld, {})
+    return programs.setdefault(get_requires_fingerprint(world), {})
+
+######################
+# Generated requires
+######################
+#
+# generate_rules.py writes the compiled tree of every requires string without {Function()} calls to GeneratedRules.py,
+# as plain functions building it, so the strings don't have to be parsed on every generation.
+# They're only used while the hash stored in it matches the hash of the loaded requires, categories and compiler version,
+# otherwise (or without the module) the requires are parsed as usual.
+
+REQUIRES_COMPILER_VERSION = 2
+
+_generated_requires = None
+
+def get_string_requires() -> list[str]:
+    """Returns every distinct string requires of the locations and regions, sorted"""
+    areas = list(location_table) + list(regionMap.values())
+    return sorted({area["requires"] for area in areas if isinstance(area.get("requires"), str)})
+
+def get_requires_source_hash() -> str:
+    """Returns the hash of what the compiled requires trees depend on: the requires, the categories and the compiler"""
+    source = {
+        "version": REQUIRES_COMPILER_VERSION,
+        "requires": get_string_requires(),
+        "categories": {name: list(items) for name, items in category_item_names.items()},
+    }
+    return hashlib.sha256(json.dumps(source, sort_keys=True).encode()).hexdigest()
+
+def get_generated_requires() -> dict:
+    """Returns the requires -> tree builder functions of GeneratedRules.py, empty if it's missing or outdated"""
+    global _generated_requires
+    if _generated_requires is None:
+        _generated_requires = {}
+        try:
+            from . import GeneratedRules
+        except ImportError:
+            return _generated_requires
+        if GeneratedRules.requires_hash == get_requires_source_hash():
+            _generated_requires = GeneratedRules.requires_builders
+        else:
+            logging.info("GeneratedRules.py is outdated, parsing the requires instead. Run generate_rules.py to update it.")
+    return _generated_requires
+
+######################
+# Per-state cache
+######################
+#
+# What a player's rules remember about a CollectionState is kept in a RequiresStateCache, looked up in a WeakKeyDictionary
+# of the world so it goes away with the state. ManualWorld.collect/remove bump its stamp whenever the player's items change,
+# anything remembered under an older stamp is stale. Running totals, like the ItemValue and category ones, are instead
+# kept up to date with each collected/removed item, fill removing items included. A copied state starts with a fresh cache.
+# Only the player's own items are tracked, which is all the requires of the player look at.
+
+class RequiresStateCache:
+    """A player's cached results for one CollectionState."""
+    __slots__ = ("items", "stamp", "regions", "paths", "functions", "values", "value_items", "categories")
+
+    def __init__(self, items):
+        self.items = items
+        self.stamp = 0
+        self.regions = {}
+        self.paths = {}
+        self.functions = {}
+        self.values = {}
+        self.value_items = {}
+        self.categories = None
+
+def get_requires_state_cache(world: "ManualWorld", state: CollectionState) -> RequiresStateCache:
+    """Returns the cache of world's player for state, a new one if state has none or its items were swapped out."""
+    items = state.prog_items[world.player]
+    cache = world.requires_state_caches.get(state)
+    if cache is None or cache.items is not items:
+        cache = world.requires_state_caches[state] = RequiresStateCache(items)
+    return cache
+
+def update_requires_state_cache(world: "ManualWorld", state: CollectionState, item_name: str, count: int):
+    """Called when count item_name were collected (or removed if negative) in state, marks the cached results as stale
+    and updates the running totals."""
+    cache = world.requires_state_caches.get(state)
+    if cache is not None:
+        cache.stamp += 1
+        for value_name, item_values in cache.value_items.items():
+            value = item_values.get(item_name)
+            if value:
+                cache.values[value_name] += count * value
+        if cache.categories is not None:
+            for category in item_category_names.get(item_name, ()):
+                cache.categories[category] = cache.categories.get(category, 0) + count
+
+def get_collected_category_count(world: "ManualWorld", state: CollectionState, category: str) -> int:
+    """Returns how many items of category the player collected in state, counted once per state then kept up to date."""
+    cache = get_requires_state_cache(world, state)
+    if cache.categories is None:
+        cache.categories = {}
+        for name, count in cache.items.items():
+            for item_category in item_category_names.get(name, ()):
+                cache.categories[item_category] = cache.categories.get(item_category, 0) + count
+    return cache.categories.get(category, 0)
+
+def get_item_value_total(world: "ManualWorld", state: CollectionState, value_name: str) -> int:
+    """Returns how much value_name the player's items of state are worth, counted once per state then kept up to date."""
+    cache = get_requires_state_cache(world, state)
+    total = cache.values.get(value_name)
+    if total is None:
+        total = 0
+        # the items' values are looked up once per state, so the updates on collect and remove are a dict lookup
+        item_values = cache.value_items[value_name] = get_items_with_value(world, world.multiworld, value_name)
+        for name, value in item_values.items():
+            count = state.count(name, world.player)
+            if count > 0:
+                total += count * value
+        cache.values[value_name] = total
+    return total
+
+def get_requires_function_kind(func) -> str:
+    """Returns what a requires function depends on, ItemValue only depends on the items"""
+    if getattr(func, "__wrapped__", func) is ItemValue:
+        return REQUIRES_ITEMS
+    kind = get_requires_function_caching(func).kind
+    return REQUIRES_ITEMS if kind == REQUIRES_STATE_INDEPENDENT else kind
+
+def get_requires_rule_kind(rule: RequiresRule) -> str:
+    """Returns what a compiled rule depends on: REQUIRES_ITEMS if only the collected items, REQUIRES_STATE if one of
+    its functions also depends on the reachable regions and REQUIRES_DYNAMIC if one may depend on anything"""
+    funcs = [call.func for call in (rule.substitution.calls if rule.substitution else ())]
+    for node in iter_requires_nodes(rule.node):
+        if isinstance(node, RequiresFunction):
+            funcs.append(node.func)
+        elif isinstance(node, RequiresSubstitution):
+            funcs.extend(call.func for call in node.calls)
+        elif isinstance(node, RequiresReference) and isinstance(node.area.get("requires"), str):
+            funcs.extend(get_requires_function(func_name) for func_name, _ in _requires_function_regex.findall(node.area["requires"]))
+    kinds = {get_requires_function_kind(func) if callable(func) else REQUIRES_DYNAMIC for func in funcs}
+    for kind in (REQUIRES_DYNAMIC, REQUIRES_STATE):
+        if kind in kinds:
+            return kind
+    return REQUIRES_ITEMS
+
+class RequiresRegionRule:
+    """A region's requires, evaluated once per state stamp and shared by the region's exits and locations.
+    If one of its functions depends on the reachable regions it's evaluated again when they change, and on every check
+    if one may depend on anything."""
+    __slots__ = ("world", "name", "rule", "node", "kind")
+
+    def __init__(self, world: "ManualWorld", name: str, rule: RequiresRule):
+        self.world = world
+        self.name = name
+        self.rule = rule
+        self.node = None
+        self.kind = None
+
+    def __call__(self, state: CollectionState) -> bool:
+        if self.node is not self.rule.node:
+            # compiled again, or switched to substituting the function results
+            self.node = self.rule.node
+            self.kind = get_requires_rule_kind(self.rule)
+        if self.kind == REQUIRES_DYNAMIC:
+            return self.rule(state)
+
+        cache = get_requires_state_cache(self.world, state)
+        version = cache.stamp if self.kind == REQUIRES_ITEMS else (cache.stamp, len(state.reachable_regions[self.rule.player]))
+        result = cache.regions.get(self.name)
+        if result is None or result[0] != version:
+            result = cache.regions[self.name] = (version, self.rule(state))
+        return result[1]
+
+######################
+# Direct location rules
+######################
+#
+# Trackers and analysis tools can get a "direct" access rule for each location, true when both the location's rule and
+# a path of entrances leading to its region are, without traversing the regions (see ManualWorld.get_direct_access_rule).
+# Once the regions are connected the graph doesn't change, so each region's path condition is built once: any of its
+# entrances whose rule and source region's path condition are both true. The regions of a cycle can't be built that
+# way, each cycle finds which of its regions the state reaches instead. The conditions are remembered per state.
+
+class RequiresAccessRule:
+    """An access rule of the multiworld (an entrance or location's), as a node."""
+    __slots__ = ("rule",)
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return self.rule(state)
+
+    def cost(self) -> int:
+        return 10
+
+class RequiresPath:
+    """The path condition of a region outside of any cycle, evaluated once per state stamp and reachable regions.
+    Evaluated on every check if one of the rules it's made of may depend on anything."""
+    __slots__ = ("world", "node", "dynamic")
+
+    def __init__(self, world: "ManualWorld", node, dynamic: bool):
+        self.world = world
+        self.node = node
+        self.dynamic = dynamic
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        if self.dynamic:
+            return self.node.evaluate(state, player)
+        cache = get_requires_state_cache(self.world, state)
+        version = (cache.stamp, len(state.reachable_regions[player]))
+        result = cache.paths.get(self)
+        if result is None or result[0] != version:
+            result = cache.paths[self] = (version, self.node.evaluate(state, player))
+        return result[1]
+
+    def cost(self) -> int:
+        return 5
+
+class RequiresCycle:
+    """The regions of a cycle of the region graph reached in a state: those entered from outside of the cycle, then
+    those the entrances inside of it lead to until no more are. Found once per state stamp and reachable regions,
+    or on every check if one of the rules it's made of may depend on anything."""
+    __slots__ = ("world", "entries", "entrances", "dynamic")
+
+    def __init__(self, world: "ManualWorld", entries: dict, entrances: tuple, dynamic: bool):
+        self.world = world
+        self.entries = entries
+        self.entrances = entrances
+        self.dynamic = dynamic
+
+    def reached(self, state: CollectionState, player: int) -> set:
+        if not self.dynamic:
+            cache = get_requires_state_cache(self.world, state)
+            version = (cache.stamp, len(state.reachable_regions[player]))
+            result = cache.paths.get(self)
+            if result is not None and result[0] == version:
+                return result[1]
+
+        reached = {name for name, entry in self.entries.items() if entry.evaluate(state, player)}
+        changed = bool(reached)
+        while changed:
+            changed = False
+            for source, target, rule in self.entrances:
+                if source in reached and target not in reached and rule(state):
+                    reached.add(target)
+                    changed = True
+
+        if not self.dynamic:
+            cache.paths[self] = (version, reached)
+        return reached
+
+class RequiresCycleRegion:
+    """The path condition of a region of a cycle, true if the cycle reached it."""
+    __slots__ = ("cycle", "name")
+
+    def __init__(self, cycle: RequiresCycle, name: str):
+        self.cycle = cycle
+        self.name = name
+
+    def evaluate(self, state: CollectionState, player: int) -> bool:
+        return self.name in self.cycle.reached(state, player)
+
+    def cost(self) -> int:
+        return 5
+
+def get_access_rule_kind(rule) -> str:
+    """Returns what an access rule depends on, like get_requires_rule_kind for the rules set by set_rules.
+    The rules set by anything else are expected to depend on the state's items and reachable regions."""
+    if isinstance(rule, ProfiledRule):
+        rule = rule.rule
+    if isinstance(rule, RequiresRegionRule):
+        rule = rule.rule
+    if isinstance(rule, RequiresRule):
+        return get_requires_rule_kind(rule)
+    return REQUIRES_STATE
+
+def get_region_components(regions: list) -> list[list]:
+    """Returns the strongly connected components of the region graph (Tarjan's algorithm). The entrances are followed
+    backwards, so each component comes after the components of the regions its entrances come from."""
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    def visit(region):
+        index[region.name] = low[region.name] = len(index)
+        stack.append(region)
+        on_stack.add(region.name)
+        for entrance in region.entrances:
+            source = entrance.parent_region
+            if source.name not in index:
+                visit(source)
+                low[region.name] = min(low[region.name], low[source.name])
+            elif source.name in on_stack:
+                low[region.name] = min(low[region.name], index[source.name])
+        if low[region.name] == index[region.name]:
+            component = []
+            while not component or component[-1] is not region:
+                component.append(stack.pop())
+                on_stack.remove(component[-1].name)
+            components.append(component)
+
+    for region in regions:
+        if region.name not in index:
+            visit(region)
+    return components
+
+def build_region_paths(world: "ManualWorld") -> dict:
+    """Returns the path condition of each region of the world, by name"""
+    origin = getattr(world, "origin_region_name", "Menu")
+    paths = {}
+    dynamic_paths = set()
+
+    def entry_path(entrances: list):
+        """Returns the condition of any of entrances being usable, and if it's evaluated on every check"""
+        operands = []
+        dynamic = False
+        for entrance in entrances:
+            source = entrance.parent_region.name
+            dynamic = dynamic or source in dynamic_paths or get_access_rule_kind(entrance.access_rule) == REQUIRES_DYNAMIC
+            operands.append(RequiresAll((paths[source], RequiresAccessRule(entrance.access_rule))))
+        return simplify_requires(RequiresAny(tuple(operands))), dynamic
+
+    for component in get_region_components(world.multiworld.get_regions(world.player)):
+        names = {region.name for region in component}
+        if len(component) == 1:
+            region = component[0]
+            if region.name == origin:
+                paths[region.name] = RequiresConst(True)
+                continue
+            # an entrance from the region itself never reaches it
+            path, dynamic = entry_path([entrance for entrance in region.entrances if entrance.parent_region is not region])
+            if not isinstance(path, RequiresConst):
+                path = RequiresPath(world, path, dynamic)
+            paths[region.name] = path
+        else:
+            entries = {}
+            entrances = []
+            dynamic = False
+            for region in component:
+                inside = [entrance for entrance in region.entrances if entrance.parent_region.name in names]
+                entrances += [(entrance.parent_region.name, region.name, entrance.access_rule) for entrance in inside]
+                dynamic = dynamic or any(get_access_rule_kind(entrance.access_rule) == REQUIRES_DYNAMIC for entrance in inside)
+                if region.name == origin:
+                    entries[region.name] = RequiresConst(True)
                     continue
-                elif isinstance(value, str):
-                    if value.lower() == 'none':
-                        value = None
-                        args[index] = value
-                        index += 1
-                        continue
+                entries[region.name], entry_dynamic = entry_path([entrance for entrance in region.entrances if entrance not in inside])
+                dynamic = dynamic or entry_dynamic
+            cycle = RequiresCycle(world, entries, tuple(entrances), dynamic)
+            for region in component:
+                paths[region.name] = RequiresCycleRegion(cycle, region.name)
+        if dynamic:
+            dynamic_paths.update(names)
+    return paths
+
+def build_direct_access_rules(world: "ManualWorld") -> dict[str, RequiresRule]:
+    """Returns the direct access rule of each location of the world, by name"""
+    paths = build_region_paths(world)
+    rules = {}
+    for region in world.multiworld.get_regions(world.player):
+        for location in region.locations:
+            node = simplify_requires(RequiresAll((RequiresAccessRule(location.access_rule), paths[region.name])))
+            rules[location.name] = RequiresRule(world.location_name_to_location.get(location.name, {}), world.player, node)
+    return rules
+
+######################
+# Rule dependencies
+######################
+#
+# set_rules records which rules mention each item, directly, through a category or through an ItemValue group,
+# so trackers and custom sweeps can only test again the rules a newly collected item can change.
+# Rules whose items can't be known in advance ({Function()} calls returning strings, canReachLocation, ...) depend on
+# every item.
+
+class RequiresDependents(NamedTuple):
+    """Names of the locations, entrances and regions whose own rule mentions an item."""
+    locations: frozenset
+    entrances: frozenset
+    regions: frozenset
+
+def get_requires_function_dependencies(world: "ManualWorld", call: RequiresFunction) -> Optional[set]:
+    """Returns the items a {Function()} call looks at, None if that can't be known."""
+    if not call.returns_bool:
+        # the requires string it returns (like OptOne's) looks at items of its own
+        return None
+    if getattr(call.func, "__wrapped__", call.func) is ItemValue:
+        value_name = call.args[0].split(":")[0].lower().strip()
+        return set(get_items_with_value(world, world.multiworld, value_name))
+    if call.caching.kind == REQUIRES_STATE_INDEPENDENT:
+        return set()
+    if call.caching.kind == REQUIRES_ITEMS:
+        return set(call.caching.items)
+    return None
+
+def get_requires_dependencies(world: "ManualWorld", rule: RequiresRule) -> Optional[set]:
+    """Returns the items a compiled rule looks at, None if that can't be known."""
+    dependencies = set()
+    for node in iter_requires_nodes(rule.node):
+        if isinstance(node, RequiresItem):
+            dependencies.add(node.name)
+        elif isinstance(node, RequiresClauses):
+            dependencies.update(name for name, _ in node.items)
+            dependencies.update(name for group in node.groups for name, _ in group)
+        elif isinstance(node, RequiresCategory):
+            dependencies.update(node.items)
+        elif isinstance(node, (RequiresSubstitution, RequiresReference)):
+            return None
+    for call in (rule.substitution.calls if rule.substitution else ()):
+        call_dependencies = get_requires_function_dependencies(world, call)
+        if call_dependencies is None:
+            return None
+        dependencies |= call_dependencies
+    return dependencies
+
+def index_requires_dependents(world: "ManualWorld", locations: dict, entrances: dict, regions: dict):
+    """Indexes by item the items each location, entrance and region rule depends on (None for any item) in
+    world.item_dependents, the rules depending on any item are also kept in world.any_item_dependents"""
+    kinds = (locations, entrances, regions)
+    world.any_item_dependents = RequiresDependents(*(frozenset(name for name, items in rules.items() if items is None)
+                                                     for rules in kinds))
+    index = {}
+    for i, rules in enumerate(kinds):
+        for name, items in rules.items():
+            for item_name in items or ():
+                index.setdefault(item_name, ([], [], []))[i].append(name)
+    world.item_dependents = {
+        item_name: RequiresDependents(*(frozenset(names) | anything for names, anything in zip(dependents, world.any_item_dependents)))
+        for item_name, dependents in index.items()
+    }
+
+######################
+# Rules profiler
+######################
+#
+# Enabled with "enable_rules_profiler" in meta.json: the calls and cumulative time of every location, entrance and region
+# rule and of every {Function()} are counted in world.rules_profile, and written out by generate_output.
+# The time of a rule includes the rules and functions it checks, like a location's region.
+
+class ProfiledRule:
+    """Counts the calls and time of an access rule in the world's rules profile"""
+    __slots__ = ("entry", "rule")
+
+    def __init__(self, entry: list, rule):
+        self.entry = entry
+        self.rule = rule
+
+    def __call__(self, state: CollectionState) -> bool:
+        start = time.perf_counter()
+        try:
+            return self.rule(state)
+        finally:
+            self.entry[0] += 1
+            self.entry[1] += time.perf_counter() - start
+
+def profile_rule(world: "ManualWorld", kind: str, name: str, rule):
+    """Returns rule, counted in the world's rules profile as the kind ("location", "entrance" or "region") name
+    if the profiler is enabled"""
+    if not enable_rules_profiler:
+        return rule
+    return ProfiledRule(world.rules_profile.setdefault((kind, name), [0, 0.0]), rule)
+
+def profile_requires_function(func):
+    """Returns func, counting its calls and time in the rules profile of the world it's called for"""
+    @wraps(func)
+    def profiled(world, multiworld, state, player, *args):
+        start = time.perf_counter()
+        try:
+            return func(world, multiworld, state, player, *args)
+        finally:
+            profile = getattr(world, "rules_profile", None)
+            if profile is not None:
+                entry = profile.setdefault(("function", func.__name__), [0, 0.0])
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+
+    caching = get_requires_function_caching(func)
+    requires_function_caching[profiled] = caching
+    return profiled
+
+def write_rules_profile(world: "ManualWorld", path: str):
+    """Writes the world's rules profile as json, hottest first, and logs a summary"""
+    entries = sorted(world.rules_profile.items(), key=lambda entry: entry[1][1], reverse=True)
+    report = [{"kind": kind, "name": name, "calls": calls, "seconds": seconds} for (kind, name), (calls, seconds) in entries]
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    locations = [entry for entry in report if entry["kind"] == "location"]
+    hottest = ", ".join(f"{entry['name']} ({entry['calls']} calls, {entry['seconds']:.3f}s)" for entry in locations[:5])
+    logging.info(f"Rules profile of {world.multiworld.get_player_name(world.player)}: {sum(entry['calls'] for entry in locations)} "
+                 f"location rule calls in {sum(entry['seconds'] for entry in locations):.3f}s, hottest: {hottest or 'none'}. "
+                 f"Written to {path}")
+
+def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
+    # the 'all', 'half' and 'N%' requires counts and the state independent functions are resolved when compiling,
+    # the item pool is final by now
+    world.compiled_requires = []
+    world.rules_profile = {}
+    program = get_requires_program(world)
+
+    # compile the requires of each region once, the same rule is shared by the region's exits and its locations
+    region_rules = {}
+    # the items each rule depends on, to index them by item once every rule is set
+    region_dependencies = {}
+    entrance_dependencies = {}
+    location_dependencies = {}
+    for name, region in regionMap.items():
+        rule = compile_requires(world, player, region, program=program)
+        region_dependencies[name] = get_requires_dependencies(world, rule)
+        # remember the result of the region per state, unless there's nothing to evaluate
+        region_rules[name] = rule if isinstance(rule.node, RequiresConst) else RequiresRegionRule(world, name, rule)
+    region_checks = {name: profile_rule(world, "region", name, rule) for name, rule in region_rules.items()}
+
+    used_location_names = []
+    # Region access rules
+    for region in regionMap.keys():
+        used_location_names.extend([l.name for l in multiworld.get_region(region, player).locations])
+        if region != "Menu":
+            for exitRegion in multiworld.get_region(region, player).exits:
+                set_rule(multiworld.get_entrance(exitRegion.name, player),
+                         profile_rule(world, "entrance", exitRegion.name, region_checks[region]))
+                entrance_dependencies[exitRegion.name] = region_dependencies[region]
+
+    # Location access rules
+    for location in world.location_table:
+        if location["name"] not in used_location_names:
+            continue
 
+        locFromWorld = multiworld.get_location(location["name"], player)
 
-            if not isinstance(value, argType):
-                if issubclass(argType, bool):
-                    #Special conversion to bool
-                    if value.lower() in ['true', '1']:
-                        value = True
+        regionRule = region_rules[location["region"]] if "region" in location else None
+        regionCheck = region_checks[location["region"]] if "region" in location else None
+        dependencies = region_dependencies[location["region"]] if "region" in location else set()
 
-                    elif value.lower() in ['false', '0']:
-                        value = False
+        if "requires" in location: # Location has requires, check them alongside the region requires
+            # the region is checked along with the location, what it already requires can be dropped from the location
+            locationRule = compile_requires(world, player, location, getattr(regionRule, "rule", regionRule), program)
+            locationDependencies = get_requires_dependencies(world, locationRule)
+            location_dependencies[location["name"]] = None if locationDependencies is None or dependencies is None \
+                                                      else locationDependencies | dependencies
 
-                    else:
-                        value = bool(value)
-                        if warn:
-                        # warning here spam the console if called from rules.py, might be worth to make it a data validation instead
-                            logging.warn(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but an unknown string was passed and thus converted to {value}")
+            def checkBothLocationAndRegion(state: CollectionState, location=locationRule, region=regionCheck):
+                if not location(state):
+                    return False
 
-                else:
-                    try:
-                        value = argType(value)
+                # default to true unless there's a region with requires
+                return not region or region(state)
 
-                    except ValueError:
-                        raise Exception(f"A call of the {func.__name__} function in '{areaName}'s requirement, asks for a value of type {argType}\nfor its argument '{info.name}' but its value '{value}' cannot be converted to {argType}")
+            set_rule(locFromWorld, profile_rule(world, "location", location["name"], checkBothLocationAndRegion))
+        elif "region" in location: # Only region access required, check the location's region's requires
+            set_rule(locFromWorld, profile_rule(world, "location", location["name"], regionCheck))
+            location_dependencies[location["name"]] = dependencies
+        else: # No location region and no location requires? It's accessible.
+            def allRegionsAccessible(state):
+                return True
 
-                args[index] = value
+            set_rule(locFromWorld, profile_rule(world, "location", location["name"], allRegionsAccessible))
 
-            index += 1
+    index_requires_dependents(world, location_dependencies, entrance_dependencies, region_dependencies)
+
+    # Victory requirement
+    multiworld.completion_condition[player] = lambda state: state.has("__Victory__", player)
 
-def ItemValue(world: World, multiworld: MultiWorld, state: CollectionState, player: int, valueCount: str, skipCache: bool = False):
+def ItemValue(world: World, multiworld: MultiWorld, state: CollectionState, player: int, valueCount: str, skipCache: bool = False) -> bool:
     """When passed a string with this format: 'valueName:int',
     this function will check if the player has collect at least 'int' valueName worth of items\n
     eg. {ItemValue(Coins:12)} will check if the player has collect at least 12 coins worth of items\n
@@ -355,35 +1692,18 @@ def ItemValue(world: World, multiworld: MultiWorld, state: CollectionState, play
     value_name = valueCount[0].lower().strip()
     requested_count = int(valueCount[1].strip())
 
-    if not hasattr(world, 'item_values_cache'): #Cache made for optimization purposes
-        world.item_values_cache = {}
-
-    if not world.item_values_cache.get(player, {}):
-        world.item_values_cache[player] = {}
-
-    if not skipCache:
-        if not world.item_values_cache[player].get(value_name, {}):
-            world.item_values_cache[player][value_name] = {
-                'state': {},
-                'count': -1,
-                }
-
-    if (skipCache or world.item_values_cache[player][value_name].get('count', -1) == -1
-            or world.item_values_cache[player][value_name].get('state') != dict(state.prog_items[player])):
-        # Run First Time, if state changed since last check or if skipCache has a value
+    if skipCache:
         existing_item_values = get_items_with_value(world, multiworld, value_name)
         total_Count = 0
         for name, value in existing_item_values.items():
             count = state.count(name, player)
             if count > 0:
                 total_Count += count * value
-        if skipCache:
-            return total_Count >= requested_count
-        world.item_values_cache[player][value_name]['count'] = total_Count
-        world.item_values_cache[player][value_name]['state'] = dict(state.prog_items[player])
-    return world.item_values_cache[player][value_name]['count'] >= requested_count
+        return total_Count >= requested_count
+    return get_item_value_total(multiworld.worlds[player], state, value_name) >= requested_count
 
 # Two useful functions to make require work if an item is disabled instead of making it inaccessible
+@state_independent
 def OptOne(world: World, multiworld: MultiWorld, state: CollectionState, player: int, item: str, items_counts: Optional[dict] = None):
     """Check if the passed item (with or without ||) is enabled, then this returns |item:count|
     where count is clamped to the maximum number of said item in the itempool.\n
@@ -412,8 +1732,7 @@ def OptOne(world: World, multiworld: MultiWorld, state: CollectionState, player:
     if require_type == 'category':
         if item_count.isnumeric():
             #Only loop if we can use the result to clamp
-            category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-            category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
+            category_items_counts = sum([items_counts.get(category_item, 0) for category_item in category_item_names.get(item_name, ())])
             item_count = clamp(int(item_count), 0, category_items_counts)
         return f"|@{item_name}:{item_count}|"
     elif require_type == 'item':
@@ -423,6 +1742,7 @@ def OptOne(world: World, multiworld: MultiWorld, state: CollectionState, player:
         return f"|{item_name}:{item_count}|"
 
 # OptAll check the passed require string and loop every item to check if they're enabled,
+@state_independent
 def OptAll(world: World, multiworld: MultiWorld, state: CollectionState, player: int, requires: str):
     """Check the passed require string and loop every item to check if they're enabled,
     then returns the require string with items counts adjusted using OptOne\n
@@ -450,16 +1770,19 @@ def OptAll(world: World, multiworld: MultiWorld, state: CollectionState, player:
     return requires_list
 
 # Rule to expose the can_reach_location core function
-def canReachLocation(world: World, multiworld: MultiWorld, state: CollectionState, player: int, location: str):
+@depends_on_state
+def canReachLocation(world: World, multiworld: MultiWorld, state: CollectionState, player: int, location: str) -> bool:
     """Can the player reach the given location?"""
     if state.can_reach_location(location, player):
         return True
     return False
 
+@state_independent
 def YamlEnabled(world: "ManualWorld", multiworld: MultiWorld, state: CollectionState, player: int, param: str) -> bool:
     """Is a yaml option enabled?"""
     return is_option_enabled(multiworld, player, param)
 
+@state_independent
 def YamlDisabled(world: "ManualWorld", multiworld: MultiWorld, state: CollectionState, player: int, param: str) -> bool:
     """Is a yaml option disabled?"""
     return not is_option_enabled(multiworld, player, param)
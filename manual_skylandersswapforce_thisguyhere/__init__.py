@@ -2,7 +2,9 @@ from base64 import b64encode
 import logging
 import os
 import json
+from collections import Counter
 from typing import Callable, Optional
+from weakref import WeakKeyDictionary
 
 import Utils
 from worlds.generic.Rules import forbid_items_for_player
@@ -10,18 +12,22 @@ from worlds.LauncherComponents import Component, SuffixIdentifier, components, T
 
 from .Data import item_table, location_table, region_table, category_table, meta_table
 from .Game import game_name, filler_item_name, starting_items
-from .Meta import world_description, world_webworld, enable_region_diagram
-from .Locations import location_id_to_name, location_name_to_id, location_name_to_location, location_name_groups, victory_names
-from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups
+from .Meta import world_description, world_webworld, enable_region_diagram, enable_rules_profiler
+from .Locations import location_id_to_name, location_name_to_id, location_name_to_location, location_name_groups, victory_names, \
+    location_forbidden_item_names, location_placements
+from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups, category_item_names, item_prototypes, \
+    get_item_classification, ItemPool, as_item_pool, remove_from_item_list
 from .DataValidation import runGenerationDataValidation, runPreFillDataValidation
 
 from .Regions import create_regions
 from .Items import ManualItem
-from .Rules import set_rules
+from .Rules import set_rules, resolve_relative_requires, update_requires_state_cache, get_collected_category_count, \
+    build_direct_access_rules, RequiresDependents, write_rules_profile
 from .Options import manual_options_data
-from .Helpers import is_item_enabled, get_option_value, get_items_for_player, resolve_yaml_option
+from .Helpers import is_item_enabled, get_option_value, get_items_for_player, resolve_yaml_option, invalidate_item_index, \
+    is_passthrough_hook
 
-from BaseClasses import ItemClassification, Tutorial, Item
+from BaseClasses import ItemClassification, Tutorial, Item, CollectionState
 from Options import PerGameCommonOptions
 from worlds.AutoWorld import World, WebWorld
 
@@ -56,7 +62,6 @@ class ManualWorld(World):
 
     filler_item_name = filler_item_name
 
-    item_counts = {}
     start_inventory = {}
 
     location_id_to_name = location_id_to_name
@@ -65,6 +70,16 @@ class ManualWorld(World):
     location_name_groups = location_name_groups
     victory_names = victory_names
 
+    def __init__(self, multiworld, player: int):
+        super().__init__(multiworld, player)
+        # per-state caches of the rules, see Rules.get_requires_state_cache
+        self.requires_state_caches = WeakKeyDictionary()
+        # results of the state independent requires functions, see Helpers.get_requires_function_caching
+        self.requires_function_results = {}
+        # real item and category counts of each player asked for, see get_item_counts
+        self.item_counts = {}
+        self.category_counts = {}
+
     def get_filler_item_name(self) -> str:
         return hook_get_filler_item_name(self, self.multiworld, self.player) or self.filler_item_name
 
@@ -103,7 +118,7 @@ class ManualWorld(World):
 
     def create_items(self):
         # Generate item pool
-        pool = []
+        pool = ItemPool()
         traps = []
         configured_item_names = self.item_id_to_name.copy()
 
@@ -125,9 +140,7 @@ class ManualWorld(World):
 
             if item_count == 0: continue
 
-            for _ in range(item_count):
-                new_item = self.create_item(name)
-                pool.append(new_item)
+            pool.extend(self.create_items_bulk(name, item_count))
 
             if item.get("early"): # Some or all early
                 if isinstance(item["early"],int) or (isinstance(item["early"],str) and item["early"].isnumeric()):
@@ -154,7 +167,7 @@ class ManualWorld(World):
                     raise Exception(f"Item {name}'s 'local_early' has an invalid value of '{item['local_early']}'. \nA boolean or an integer was expected.")
 
 
-        pool = before_create_items_starting(pool, self, self.multiworld, self.player)
+        pool = as_item_pool(before_create_items_starting(pool, self, self.multiworld, self.player))
 
         items_started = []
 
@@ -175,14 +188,18 @@ class ManualWorld(World):
 
                 # if the setting lists specific item names, limit the items to just those
                 if "items" in starting_item_block:
-                    items = [item for item in pool if item.name in starting_item_block["items"]]
+                    items = pool.named(starting_item_block["items"])
 
                 # if the setting lists specific item categories, limit the items to ones that have any of those categories
                 if "item_categories" in starting_item_block:
-                    items_in_categories = [item["name"] for item in self.item_name_to_item.values() if "category" in item and len(set(starting_item_block["item_categories"]).intersection(item["category"])) > 0]
-                    items = [item for item in pool if item.name in items_in_categories]
+                    items = pool.in_categories(starting_item_block["item_categories"])
 
-                self.random.shuffle(items)
+                if items is pool:
+                    # shuffling the full pool reorders it
+                    pool.shuffle(self.random)
+                    items = pool.to_list()
+                else:
+                    self.random.shuffle(items)
 
                 # if the setting lists a specific number of random items that should be pulled, only use a subset equal to that number
                 if "random" in starting_item_block:
@@ -193,41 +210,57 @@ class ManualWorld(World):
                     self.multiworld.push_precollected(starting_item)
                     pool.remove(starting_item)
 
-        self.start_inventory = {i.name: items_started.count(i) for i in items_started}
+        self.start_inventory = dict(Counter(i.name for i in items_started))
 
-        pool = before_create_items_filler(pool, self, self.multiworld, self.player)
-        pool = self.adjust_filler_items(pool, traps)
-        pool = after_create_items(pool, self, self.multiworld, self.player)
+        pool = as_item_pool(before_create_items_filler(pool, self, self.multiworld, self.player))
+        pool = as_item_pool(self.adjust_filler_items(pool, traps))
+        pool = as_item_pool(after_create_items(pool, self, self.multiworld, self.player))
 
         # need to put all of the items in the pool so we can have a full state for placement
         # then will remove specific item placements below from the overall pool
-        self.multiworld.itempool += pool
+        self.multiworld.itempool += pool.to_list()
+        # in case the hooks counted the items before the pool was final
+        self.invalidate_item_counts()
 
     def create_item(self, name: str) -> Item:
         name = before_create_item(name, self, self.multiworld, self.player)
 
-        item = self.item_name_to_item[name]
-        classification = ItemClassification.filler
-
-        if "trap" in item and item["trap"]:
-            classification = ItemClassification.trap
-
-        if "useful" in item and item["useful"]:
-            classification = ItemClassification.useful
-
-        if "progression" in item and item["progression"]:
-            classification = ItemClassification.progression
-
-        if "progression_skip_balancing" in item and item["progression_skip_balancing"]:
-            classification = ItemClassification.progression_skip_balancing
-
-        item_object = ManualItem(name, classification,
-                        self.item_name_to_id[name], player=self.player)
+        prototype = item_prototypes.get(name)
+        if prototype is None: # an item added to the lookups after they were loaded
+            prototype = (get_item_classification(self.item_name_to_item[name]), self.item_name_to_id[name])
+        classification, code = prototype
+        item_object = ManualItem(name, classification, code, player=self.player)
 
         item_object = after_create_item(item_object, self, self.multiworld, self.player)
 
         return item_object
 
+    def create_items_bulk(self, name: str, count: int) -> list[Item]:
+        """creates count copies of an item, like calling create_item count times.
+        while the create_item hooks are left as is, they're only called for the first copy and the others are made like it"""
+        if count <= 0:
+            return []
+        if not is_passthrough_hook(before_create_item) or not is_passthrough_hook(after_create_item):
+            return [self.create_item(name) for _ in range(count)]
+
+        first = self.create_item(name)
+        items = [first]
+        classification, code, player = first.classification, first.code, self.player
+        items.extend(ManualItem(name, classification, code, player=player) for _ in range(count - 1))
+        return items
+
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        changed = super().collect(state, item)
+        if changed:
+            update_requires_state_cache(self, state, item.name, 1)
+        return changed
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        changed = super().remove(state, item)
+        if changed:
+            update_requires_state_cache(self, state, item.name, -1)
+        return changed
+
     def set_rules(self):
         before_set_rules(self, self.multiworld, self.player)
 
@@ -237,73 +270,43 @@ class ManualWorld(World):
 
     def generate_basic(self):
         before_generate_basic(self, self.multiworld, self.player)
+        # the other worlds and the hook may have changed the items since create_items
+        invalidate_item_index(self.multiworld)
 
         # Handle item forbidding
-        manual_locations_with_forbid = {location['name']: location for location in location_name_to_location.values() if "dont_place_item" in location or "dont_place_item_category" in location}
-        locations_with_forbid = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in manual_locations_with_forbid.keys()]
-        for location in locations_with_forbid:
-            manual_location = manual_locations_with_forbid[location.name]
-            forbidden_item_names = []
-
-            if manual_location.get("dont_place_item"):
-                forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if i["name"] in manual_location["dont_place_item"]])
-
-            if manual_location.get("dont_place_item_category"):
-                forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])])
-
+        for location in self.multiworld.get_unfilled_locations(player=self.player):
+            forbidden_item_names = location_forbidden_item_names.get(location.name)
             if forbidden_item_names:
                 forbid_items_for_player(location, set(forbidden_item_names), self.player)
 
         # Handle specific item placements using fill_restrictive
-        manual_locations_with_placements = {location['name']: location for location in location_name_to_location.values() if "place_item" in location or "place_item_category" in location}
-        locations_with_placements = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in manual_locations_with_placements.keys()]
+        locations_with_placements = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in location_placements]
+        # the player's items still in the pool, from the player's item index, to find the eligible items by name
+        pool = ItemPool(item for item in get_items_for_player(self.multiworld, self.player) if item.location is None) \
+            if locations_with_placements else ItemPool()
+        placed_items = []
         for location in locations_with_placements:
-            manual_location = manual_locations_with_placements[location.name]
-            eligible_items = []
-            eligible_item_names = []
-            forbidden_item_names = []
-            place_messages = []
-            forbid_messages = []
-
-            #First we get possible items names
-            if manual_location.get("place_item"):
-                eligible_item_names += manual_location["place_item"]
-                place_messages.append('", "'.join(manual_location["place_item"]))
-
-            if manual_location.get("place_item_category"):
-                eligible_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["place_item_category"])]
-                place_messages.append('", "'.join(manual_location["place_item_category"]) + " category(ies)")
-
-            # Second we check for forbidden items names
-            if manual_location.get("dont_place_item"):
-                forbidden_item_names += manual_location["dont_place_item"]
-                forbid_messages.append('", "'.join(manual_location["dont_place_item"]) + ' items')
-
-            if manual_location.get("dont_place_item_category"):
-                forbidden_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])]
-                forbid_messages.append('", "'.join(manual_location["dont_place_item_category"]) + ' category(ies)')
-
-            # If we forbid some names, check for those in the possible names and remove them
-            if forbidden_item_names:
-                eligible_item_names = [name for name in eligible_item_names if name not in forbidden_item_names]
-
-            if eligible_item_names:
-                eligible_items = [item for item in self.multiworld.itempool if item.player == self.player and item.name in eligible_item_names]
+            placement = location_placements[location.name]
+            eligible_items = pool.named(placement.eligible_item_names)
 
             if len(eligible_items) == 0:
                 nl = "\n"
-                if forbidden_item_names:
-                    raise Exception(f'Could not find a suitable item to place at "{manual_location["name"]}".\n    No items that match "{f"{nl}     or ".join(place_messages)}"\n    Maybe because of forbidden "{f"{nl}     or ".join(forbid_messages)}"')
-                raise Exception(f'Could not find a suitable item to place at "{manual_location["name"]}". \n    No items that match "{f"{nl}     or ".join(place_messages)}"')
+                if placement.forbidden_item_names:
+                    raise Exception(f'Could not find a suitable item to place at "{location.name}".\n    No items that match "{f"{nl}     or ".join(placement.place_messages)}"\n    Maybe because of forbidden "{f"{nl}     or ".join(placement.forbid_messages)}"')
+                raise Exception(f'Could not find a suitable item to place at "{location.name}". \n    No items that match "{f"{nl}     or ".join(placement.place_messages)}"')
 
             item_to_place = self.random.choice(eligible_items)
             location.place_locked_item(item_to_place)
 
             # remove the item we're about to place from the pool so it isn't placed twice
-            self.multiworld.itempool.remove(item_to_place)
+            pool.remove(item_to_place)
+            placed_items.append(item_to_place)
 
+        remove_from_item_list(self.multiworld.itempool, placed_items)
 
         after_generate_basic(self, self.multiworld, self.player)
+        # the hooks may have changed the items without changing the length of the pool
+        invalidate_item_index(self.multiworld)
 
         # Enable this in Meta.json to generate a diagram of your manual.  Only works on 0.4.4+
         if enable_region_diagram:
@@ -311,9 +314,15 @@ class ManualWorld(World):
             visualize_regions(self.multiworld.get_region("Menu", self.player), f"{self.game}_{self.player}.puml")
 
     def pre_fill(self):
+        # the start inventory was taken out of the item pool since generate_basic
+        invalidate_item_index(self.multiworld)
         # DataValidation after all the hooks are done but before fill
         runPreFillDataValidation(self, self.multiworld)
 
+    def post_fill(self):
+        # the items were placed
+        invalidate_item_index(self.multiworld)
+
     def fill_slot_data(self):
         slot_data = before_fill_slot_data({}, self, self.multiworld, self.player)
 
@@ -334,6 +343,10 @@ class ManualWorld(World):
         with open(os.path.join(output_directory, filename), 'wb') as f:
             f.write(b64encode(bytes(json.dumps(data), 'utf-8')))
 
+        # Enable this in Meta.json to write how often and how long the rules of each location, entrance and region were checked
+        if enable_rules_profiler:
+            write_rules_profile(self, os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}_rules_profile.json"))
+
     def write_spoiler(self, spoiler_handle):
         before_write_spoiler(self, self.multiworld, spoiler_handle)
 
@@ -406,9 +419,59 @@ class ManualWorld(World):
 
         if not self.item_counts.get(player, {}) or reset:
             real_pool = get_items_for_player(self.multiworld, player, True)
-            self.item_counts[player] = {i.name: real_pool.count(i) for i in real_pool}
+            self.item_counts[player] = dict(Counter(i.name for i in real_pool))
+            self.category_counts.pop(player, None)
+            if reset and player == self.player:
+                # the 'all', 'half' and 'N%' requires counts of this world's rules were resolved against the previous counts
+                resolve_relative_requires(self)
         return self.item_counts.get(player)
 
+    def invalidate_item_counts(self, player: Optional[int] = None):
+        """forgets the real item and category counts of player and the multiworld's item index, to call after changing its
+        item pool before the rules are set.
+        they're counted again the next time they're needed, use get_item_counts(reset=True) once the rules are set"""
+        if player is None:
+            player = self.player
+
+        self.item_counts.pop(player, None)
+        self.category_counts.pop(player, None)
+        invalidate_item_index(self.multiworld)
+
+    def count_category(self, state: CollectionState, category: str) -> int:
+        """returns how many items of category the player collected in state, without counting each item of the category"""
+        return get_collected_category_count(self, state, category)
+
+    def get_reachable_locations(self, state: CollectionState) -> frozenset[int]:
+        """returns the ids of every location of the player reachable with state, in one pass:
+        the regions are reached once, then only the locations of reachable regions are checked, sharing their region's result"""
+        state.update_reachable_regions(self.player)
+        return frozenset(location.address
+                         for region in state.reachable_regions[self.player]
+                         for location in region.locations
+                         if location.address is not None and location.access_rule(state))
+
+    def get_direct_access_rule(self, location_name: str) -> Callable[[CollectionState], bool]:
+        """returns a rule telling if a location is reachable with a state without traversing the regions, for trackers.
+        the rules of every location are built the first time, once the regions and rules are final"""
+        if getattr(self, "direct_access_rules", None) is None:
+            self.direct_access_rules = build_direct_access_rules(self)
+        return self.direct_access_rules[location_name]
+
+    def get_item_dependents(self, item_name: str) -> RequiresDependents:
+        """returns the locations, entrances and regions whose own rule can change when item_name is collected or removed"""
+        return self.item_dependents.get(item_name, self.any_item_dependents)
+
+    def get_category_counts(self, player: Optional[int] = None, reset: bool = False) -> dict[str, int]:
+        """returns the player real item count of each category, totalled from get_item_counts"""
+        if player is None:
+            player = self.player
+
+        items_counts = self.get_item_counts(player, reset)
+        if player not in self.category_counts:
+            self.category_counts[player] = {category: sum(items_counts.get(name, 0) for name in names)
+                                            for category, names in category_item_names.items()}
+        return self.category_counts[player]
+
     def client_data(self):
         return {
             "game": self.game,
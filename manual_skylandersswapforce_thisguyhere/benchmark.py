@@ -0,0 +1,138 @@
+# Benchmark of the rules of this world, over the real data files and a few option presets.
+# Run it from an Archipelago checkout with the apworld (or this folder) in worlds/, eg:
+#   python -m worlds.manual_skylandersswapforce_thisguyhere.benchmark --output rules_benchmark.json
+# It measures how many requires are compiled per second, how many rules are evaluated per second against random
+# CollectionStates and how long a full sweep takes once the items are placed, then writes them as json so results
+# of different versions can be compared.
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import time
+from typing import Callable, Optional
+
+from BaseClasses import CollectionState, MultiWorld
+from test.TestBase import WorldTestBase
+
+from .Game import game_name
+from .Regions import regionMap
+from .Rules import compile_requires
+
+presets = {
+    "linear": {},
+    "nonlinear": {"linear_mode": False},
+    "shopsanity": {"shopsanity": True},
+    "all_packs": {"include_empire": True, "include_ship": True, "include_crypt": True, "include_peak": True,
+                  "active_items": True, "battle_packs": True, "challenges_as_locations": True},
+    "nonlinear_all_packs": {"linear_mode": False, "shopsanity": True, "include_empire": True, "include_ship": True,
+                            "include_crypt": True, "include_peak": True, "active_items": True, "battle_packs": True,
+                            "challenges_as_locations": True},
+}
+
+class BenchmarkSetup(WorldTestBase):
+    game = game_name
+
+    def runTest(self):
+        pass
+
+def setup_multiworld(options: dict, seed: int) -> MultiWorld:
+    """Generates a solo multiworld of this game with options, up to pre_fill, like the tests do"""
+    setup = BenchmarkSetup()
+    setup.options = options
+    setup.world_setup(seed)
+    return setup.multiworld
+
+def timed(func: Callable, repeat: int, setup: Optional[Callable] = None) -> list[float]:
+    """Returns how many seconds each of repeat calls of func took, setup is called (untimed) before each one"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def random_states(multiworld: MultiWorld, player: int, count: int, rng: random.Random) -> list[CollectionState]:
+    """Returns count states holding a random share of the player's progression items"""
+    items = [item for item in multiworld.get_items() if item.player == player and item.advancement]
+    states = []
+    for _ in range(count):
+        state = CollectionState(multiworld)
+        for item in rng.sample(items, rng.randint(0, len(items))):
+            state.collect(item, True)
+        states.append(state)
+    return states
+
+def sweep(multiworld: MultiWorld):
+    state = CollectionState(multiworld)
+    if hasattr(state, "sweep_for_advancements"):
+        state.sweep_for_advancements()
+    else:
+        state.sweep_for_events()
+
+def benchmark_preset(options: dict, seed: int, states: int, repeat: int) -> dict:
+    multiworld = setup_multiworld(options, seed)
+    player = 1
+    world = multiworld.worlds[player]
+
+    areas = list(regionMap.values()) + [location for location in world.location_table if "requires" in location]
+    # compile_requires registers every rule it compiles on the world, keep its own rules only once timed
+    compiled_requires = list(world.compiled_requires)
+    compile_times = timed(lambda: [compile_requires(world, player, area) for area in areas], repeat)
+    world.compiled_requires = compiled_requires
+
+    rules = [location.access_rule for location in multiworld.get_locations(player)]
+    rules += [exit.access_rule for region in multiworld.get_regions(player) for exit in region.exits]
+    test_states = random_states(multiworld, player, states, random.Random(seed))
+    # start every run without the results cached for the states by the previous one
+    clear_caches = world.requires_state_caches.clear
+    evaluation_times = timed(lambda: [rule(state) for state in test_states for rule in rules], repeat, clear_caches)
+    batch_times = timed(lambda: [world.get_reachable_locations(state) for state in test_states], repeat, clear_caches)
+
+    from Fill import distribute_items_restrictive
+    distribute_items_restrictive(multiworld)
+    sweep_times = timed(lambda: sweep(multiworld), repeat)
+
+    return {
+        "options": options,
+        "locations": len(multiworld.get_locations(player)),
+        "compiled_requires": len(areas),
+        "compiled_requires_per_second": len(areas) / min(compile_times),
+        "rule_evaluations": len(rules) * len(test_states),
+        "rule_evaluations_per_second": len(rules) * len(test_states) / min(evaluation_times),
+        "reachable_location_sets_per_second": len(test_states) / min(batch_times),
+        "sweep_seconds_min": min(sweep_times),
+        "sweep_seconds_median": statistics.median(sweep_times),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Benchmark the rules of {game_name}")
+    parser.add_argument("--output", default="rules_benchmark.json", help="json file to write the results to")
+    parser.add_argument("--preset", action="append", choices=list(presets), help="only run these presets")
+    parser.add_argument("--states", type=int, default=50, help="random states to evaluate the rules against")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each measure, the best one is kept")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {
+        "game": game_name,
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "states": args.states,
+        "repeat": args.repeat,
+        "presets": {},
+    }
+    for name in args.preset or presets:
+        logging.info(f"Benchmarking the {name} preset")
+        results["presets"][name] = benchmark_preset(presets[name], args.seed, args.states, args.repeat)
+        print(f"{name}: {json.dumps(results['presets'][name])}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# Differential fuzzer of the compiled rules of this world against the reference evaluator (fullLocationOrRegionCheck).
+# Run it from an Archipelago checkout with the apworld (or this folder) in worlds/, eg:
+#   python -m worlds.manual_skylandersswapforce_thisguyhere.fuzz_rules --runs 20 --output rules_fuzz.json
+# Every run generates the world with random options, then evaluates the access rule of every location and entrance, plus
+# random requires built from the game's items and categories, with both engines against random CollectionStates and
+# after each step of a random walk of collects and removes on one state.
+# Any difference (in the result or in the exception raised) is reported, along with how much faster the compiled
+# rules were, and written as json. It exits with an error if there was a mismatch.
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import time
+from typing import Callable
+
+from BaseClasses import CollectionState, MultiWorld
+from Options import Choice, NumericOption, PerGameCommonOptions, Range
+
+from . import ManualWorld
+from .Game import game_name
+from .Items import category_item_names
+from .Regions import regionMap
+from .Rules import RequiresConst, RequiresRule, build_requires_rule, fullLocationOrRegionCheck
+from .benchmark import random_states, setup_multiworld
+
+# the separators and counts the reference evaluator handles in its own ways
+requires_operators = [" and ", " or ", " AND ", " OR ", " & ", " | ", "&", "|"]
+requires_counts = ["", ":1", ":2", ":3", ":0", ":all", ":half", ":50%", ":100%", ":150%"]
+
+def random_options(multiworld_options: type, rng: random.Random) -> dict:
+    """Returns a random value for each option of the game that isn't common to every game"""
+    options = {}
+    for name, option in multiworld_options.type_hints.items():
+        if name in PerGameCommonOptions.type_hints:
+            continue
+        if issubclass(option, Choice):
+            options[name] = rng.choice(sorted(set(option.options.values())))
+        elif issubclass(option, Range):
+            options[name] = rng.randint(option.range_start, option.range_end)
+        elif issubclass(option, NumericOption):
+            options[name] = rng.random() < 0.5
+    return options
+
+def random_string_requires(world, rng: random.Random, depth: int = 0) -> str:
+    """Returns a random requires string over the world's items and categories"""
+    terms = []
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if depth < 2 and roll < 0.2:
+            term = f"({random_string_requires(world, rng, depth + 1)})"
+        elif roll < 0.6:
+            term = f"|{rng.choice(list(world.item_name_to_item))}{rng.choice(requires_counts)}|"
+        elif roll < 0.9:
+            term = f"|@{rng.choice(list(category_item_names))}{rng.choice(requires_counts)}|"
+        else:
+            term = rng.choice(["1", "0", "{YamlEnabled(linear_mode)}", "{YamlDisabled(linear_mode)}"])
+        terms.append(term)
+    requires = terms[0]
+    for term in terms[1:]:
+        requires += rng.choice(requires_operators) + term
+    return requires
+
+def random_dict_requires(world, rng: random.Random) -> list:
+    """Returns a random dict/list form requires over the world's items"""
+    def random_item():
+        return rng.choice(list(world.item_name_to_item)) + rng.choice(["", ":1", ":2", ":3"])
+
+    requires = []
+    for _ in range(rng.randint(1, 3)):
+        roll = rng.random()
+        if roll < 0.2:
+            requires.append([random_item() for _ in range(rng.randint(1, 3))])
+        elif roll < 0.4:
+            requires.append({"or": [random_item() for _ in range(rng.randint(1, 3))]})
+        else:
+            requires.append(random_item())
+    return requires
+
+def outcome(check: Callable, state: CollectionState) -> tuple:
+    """Returns the result of check(state), or the type of the exception it raised"""
+    try:
+        return "result", bool(check(state))
+    except Exception as e:
+        return "error", type(e).__name__
+
+def access_rule_checks(multiworld: MultiWorld, player: int) -> list[tuple]:
+    """Returns the (kind, name, requires, reference, compiled) checks of the access rule of every location and entrance.
+    A location needs its own and its region's requires, an entrance the requires of the region it leaves (but Menu's)."""
+    world = multiworld.worlds[player]
+    checks = []
+    for location in multiworld.get_locations(player):
+        area = world.location_name_to_location.get(location.name, {})
+        region = regionMap.get(area.get("region"), {})
+        reference = lambda state, area=area, region=region: \
+            fullLocationOrRegionCheck(state, player, area) and fullLocationOrRegionCheck(state, player, region)
+        checks.append(("location", location.name, area.get("requires"), reference, location.access_rule))
+    for region in multiworld.get_regions(player):
+        area = regionMap.get(region.name, {}) if region.name != "Menu" else {}
+        for entrance in region.exits:
+            reference = lambda state, area=area: fullLocationOrRegionCheck(state, player, area)
+            checks.append(("entrance", entrance.name, area.get("requires"), reference, entrance.access_rule))
+    return checks
+
+def random_requires_checks(world, rng: random.Random, count: int) -> list[tuple]:
+    """Returns the checks of count random requires, compiled without adding them to the world's rules"""
+    checks = []
+    for _ in range(count):
+        requires = random_string_requires(world, rng) if rng.random() < 0.8 else random_dict_requires(world, rng)
+        area = {"name": "Fuzzed requires", "requires": requires}
+        rule = RequiresRule(area, world.player, RequiresConst(True))
+        build_requires_rule(world, rule)
+        reference = lambda state, area=area: fullLocationOrRegionCheck(state, world.player, area)
+        checks.append(("requires", area["name"], requires, reference, rule))
+    return checks
+
+def random_walk(multiworld: MultiWorld, player: int, steps: int, rng: random.Random):
+    """Yields the same state after each of steps random collects or removes of the player's progression items"""
+    items = [item for item in multiworld.get_items() if item.player == player and item.advancement]
+    state = CollectionState(multiworld)
+    collected = []
+    for _ in range(steps):
+        if collected and rng.random() < 0.4:
+            state.remove(collected.pop(rng.randrange(len(collected))))
+        else:
+            item = rng.choice(items)
+            state.collect(item, True)
+            collected.append(item)
+        yield state
+
+def fuzz_run(multiworld: MultiWorld, seed: int, states: int, walk: int, random_requires: int, max_mismatches: int) -> dict:
+    player = 1
+    world = multiworld.worlds[player]
+    rng = random.Random(seed)
+
+    checks = access_rule_checks(multiworld, player) + random_requires_checks(world, rng, random_requires)
+    mismatched = set()
+    mismatches = []
+    evaluations = 0
+    reference_seconds = 0.0
+    compiled_seconds = 0.0
+    # fresh states, then one state going through collects and removes, which the compiled rules' caches follow
+    for state in itertools.chain(random_states(multiworld, player, states, rng), random_walk(multiworld, player, walk, rng)):
+        for index, (kind, name, requires, reference, compiled) in enumerate(checks):
+            if index in mismatched:
+                continue
+            start = time.perf_counter()
+            expected = outcome(reference, state)
+            reference_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            actual = outcome(compiled, state)
+            compiled_seconds += time.perf_counter() - start
+            evaluations += 1
+            if expected != actual:
+                mismatched.add(index)
+                if len(mismatches) < max_mismatches:
+                    mismatches.append({
+                        "kind": kind,
+                        "name": name,
+                        "requires": requires,
+                        "expected": expected,
+                        "actual": actual,
+                        "items": sorted(state.prog_items[player].elements()),
+                    })
+
+    return {
+        "checks": len(checks),
+        "evaluations": evaluations,
+        "mismatches": mismatches,
+        "reference_seconds": reference_seconds,
+        "compiled_seconds": compiled_seconds,
+        "speedup": reference_seconds / compiled_seconds if compiled_seconds else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Fuzz the compiled rules of {game_name} against the reference evaluator")
+    parser.add_argument("--output", default="rules_fuzz.json", help="json file to write the results to")
+    parser.add_argument("--runs", type=int, default=10, help="worlds to generate, each with random options")
+    parser.add_argument("--states", type=int, default=25, help="random states to evaluate the rules against per run")
+    parser.add_argument("--walk", type=int, default=100, help="random collects and removes on one state per run, "
+                                                              "the rules are evaluated after each of them")
+    parser.add_argument("--random-requires", type=int, default=200, help="random requires to compile per run")
+    parser.add_argument("--max-mismatches", type=int, default=20, help="mismatches to report per run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = {"game": game_name, "seed": args.seed, "states": args.states, "runs": []}
+    for index in range(args.runs):
+        seed = rng.getrandbits(32)
+        options = random_options(ManualWorld.options_dataclass, rng)
+        logging.info(f"Fuzzing run {index} with seed {seed}")
+        result = {"seed": seed, "options": options}
+        result.update(fuzz_run(setup_multiworld(options, seed), seed, args.states, args.walk, args.random_requires,
+                               args.max_mismatches))
+        results["runs"].append(result)
+        print(f"run {index}: {result['evaluations']} evaluations, {len(result['mismatches'])} mismatches, "
+              f"{result['speedup']:.1f}x faster")
+
+    reference_seconds = sum(run["reference_seconds"] for run in results["runs"])
+    compiled_seconds = sum(run["compiled_seconds"] for run in results["runs"])
+    results["mismatches"] = sum(len(run["mismatches"]) for run in results["runs"])
+    results["speedup"] = reference_seconds / compiled_seconds if compiled_seconds else None
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{results['mismatches']} mismatches, compiled rules {results['speedup']:.1f}x faster")
+    if results["mismatches"]:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
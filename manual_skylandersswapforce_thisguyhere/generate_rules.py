@@ -0,0 +1,67 @@
+# Writes GeneratedRules.py: the compiled (and simplified) tree of every requires string of data/locations.json and data/regions.json
+# without {Function()} calls, as plain functions, so generations don't have to parse them again.
+# Run it from an Archipelago checkout with this folder in worlds/, after every change to the requires or categories:
+#   python -m worlds.manual_skylandersswapforce_thisguyhere.generate_rules
+# If it isn't run, Rules.py sees the hash in GeneratedRules.py doesn't match and parses the requires like before.
+
+import os
+
+from .Rules import RequiresFallback, RequiresConst, RequiresItem, RequiresCategory, RequiresNot, RequiresSequence, \
+    RequiresAll, RequiresAny, get_string_requires, get_requires_source_hash, parse_requires, short_circuit_requires, simplify_requires
+
+def requires_node_source(node) -> str:
+    """Returns the python expression building a compiled requires tree"""
+    if isinstance(node, RequiresConst):
+        return f"RequiresConst({node.value!r})"
+    if isinstance(node, RequiresItem):
+        return f"RequiresItem({node.name!r}, {node.count!r}, {node.relative!r})"
+    if isinstance(node, RequiresCategory):
+        return f"RequiresCategory({node.name!r}, category_item_names[{node.name!r}], {node.count!r}, {node.relative!r})"
+    if isinstance(node, RequiresNot):
+        return f"RequiresNot({requires_node_source(node.operand)})"
+    if isinstance(node, RequiresSequence):
+        rest = "".join(f"({op!r}, {requires_node_source(operand)}), " for op, operand in node.rest)
+        return f"RequiresSequence({requires_node_source(node.first)}, ({rest}))"
+    if isinstance(node, (RequiresAll, RequiresAny)):
+        operands = "".join(f"{requires_node_source(operand)}, " for operand in node.operands)
+        return f"{type(node).__name__}(({operands}))"
+    raise RequiresFallback(f"{type(node).__name__} can't be generated")
+
+def generate_rules_source() -> str:
+    """Returns the source of GeneratedRules.py for the loaded data"""
+    lines = [
+        "# Generated by generate_rules.py from the requires of data/locations.json and data/regions.json, don't edit it.",
+        "# Rules.py only uses it while requires_hash matches the loaded requires and categories.",
+        "",
+        "from .Items import category_item_names",
+        "from .Rules import RequiresConst, RequiresItem, RequiresCategory, RequiresNot, RequiresSequence, RequiresAll, RequiresAny",
+        "",
+        f"requires_hash = {get_requires_source_hash()!r}",
+        "",
+    ]
+    builders = []
+    for requires in get_string_requires():
+        try:
+            node, calls = parse_requires(requires, "generate_rules")
+            if calls:
+                continue # function results depend on the player, these are compiled at generation
+            source = requires_node_source(simplify_requires(short_circuit_requires(node)))
+        except RequiresFallback:
+            continue
+        name = f"requires_{len(builders)}"
+        builders.append((requires, name))
+        lines += [f"def {name}():", f"    # {requires}", f"    return {source}", ""]
+
+    lines.append("requires_builders = {")
+    lines += [f"    {requires!r}: {name}," for requires, name in builders]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def main():
+    path = os.path.join(os.path.dirname(__file__), "GeneratedRules.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(generate_rules_source())
+    print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
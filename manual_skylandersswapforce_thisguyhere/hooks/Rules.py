@@ -1,22 +1,34 @@
 from typing import Optional
 from worlds.AutoWorld import World
-from ..Helpers import clamp, get_items_with_value, is_option_enabled, get_option_value
+from ..Helpers import clamp, get_items_with_value, is_option_enabled, get_option_value, \
+    state_independent, depends_on_items, depends_on_state, dynamic
+from ..Items import category_item_names
 from BaseClasses import MultiWorld, CollectionState
 
 import re
 
 # Sometimes you have a requirement that is just too messy or repetitive to write out with boolean logic.
 # Define a function here, and you can use it in a requires string with {function_name()}.
-def overfishedAnywhere(world: World, multiworld: MultiWorld, state: CollectionState, player: int):
+# If your function always returns a bool, annotate it with -> bool so the requires around it can skip calling it once their result is known.
+def overfishedAnywhere(world: World, multiworld: MultiWorld, state: CollectionState, player: int) -> bool:
     """Has the player collected all fish from any fishing log?"""
     for cat, items in world.item_name_groups:
         if cat.endswith("Fishing Log") and state.has_all(items, player):
             return True
     return False
 
+# Decorate your function to tell the rules how long its result can be reused, otherwise it's called on every check:
+#   @state_independent if it only depends on the yaml options and the item pool (not on what was collected),
+#       it's called once when the rules are set.
+#   @depends_on_items("Item", "@Category", ...) if it only depends on how many of these items were collected.
+#   @depends_on_state if it only depends on the player's collected items and reachable regions, like state.can_reach.
+#   @dynamic if it depends on anything else, same as no decorator.
+# To count the collected items of a whole category, world.count_category(state, "Category") is faster than counting each item.
+
 # You can also pass an argument to your function, like {function_name(15)}
 # Note that all arguments are strings, so you'll need to convert them to ints if you want to do math.
-def anyClassLevel(world: World, multiworld: MultiWorld, state: CollectionState, player: int, level: str):
+@depends_on_items("Figher Level", "Black Belt Level", "Thief Level", "Red Mage Level", "White Mage Level", "Black Mage Level")
+def anyClassLevel(world: World, multiworld: MultiWorld, state: CollectionState, player: int, level: str) -> bool:
     """Has the player reached the given level in any class?"""
     for item in ["Figher Level", "Black Belt Level", "Thief Level", "Red Mage Level", "White Mage Level", "Black Mage Level"]:
         if state.count(item, player) >= int(level):
@@ -24,10 +36,12 @@ def anyClassLevel(world: World, multiworld: MultiWorld, state: CollectionState,
     return False
 
 # You can also return a string from your function, and it will be evaluated as a requires string.
+@state_independent
 def requiresMelee(world: World, multiworld: MultiWorld, state: CollectionState, player: int):
     """Returns a requires string that checks if the player has unlocked the tank."""
     return "|Figher Level:15| or |Black Belt Level:15| or |Thief Level:15|"
 
+@state_independent
 def OptOneDynamic(world: World, multiworld: MultiWorld, state: CollectionState, player: int, item: str, items_counts: Optional[dict] = None):
     """Check if the passed item (with or without ||) is enabled, then this returns |item:yamlOpt|
     where yamlOpt is the count specified in the yaml option, clamped to the maximum number of said item in the itempool.\n
@@ -56,8 +70,7 @@ def OptOneDynamic(world: World, multiworld: MultiWorld, state: CollectionState,
     if require_type == 'category':
         if item_count.isnumeric():
             #Only loop if we can use the result to clamp
-            category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-            category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
+            category_items_counts = sum([items_counts.get(category_item, 0) for category_item in category_item_names.get(item_name, ())])
             item_count = clamp(int(item_count), 1, category_items_counts)
         return f"|@{item_name}:{item_count}|"
     elif require_type == 'item':
@@ -3,7 +3,7 @@ from worlds.AutoWorld import World
 from BaseClasses import MultiWorld, CollectionState, ItemClassification
 
 # Object classes from Manual -- extending AP core -- representing items and locations that are used in generation
-from ..Items import ManualItem
+from ..Items import ManualItem, ItemPool
 from ..Locations import ManualLocation
 
 # Raw JSON data from the Manual apworld, respectively:
@@ -14,6 +14,10 @@ from ..Data import game_table, item_table, location_table, region_table
 # These helper methods allow you to determine if an option has been set, or what its value is, for any player in the multiworld
 from ..Helpers import is_option_enabled, get_option_value, is_location_name_enabled, is_item_name_enabled
 
+# Marks the create_item hooks below as unchanged, so the copies of an item are created without calling them for each one.
+# Remove it from a hook once you add code to it.
+from ..Helpers import passthrough_hook
+
 # calling logging.info("message") anywhere below in this file will output the message to both console and log file
 import logging
 
@@ -70,8 +74,12 @@ def after_create_regions(world: World, multiworld: MultiWorld, player: int):
         hub = multiworld.get_region("Hub", player)
         hub.add_exits(chapters)    
 
+# The item pools given to the hooks below are ItemPools (see Items.py), mutable sequences that work like a list and can be
+# returned as is or as a list. item_pool.take("Item Name") and item_pool.take_category("Category Name") remove and return
+# the first copy of an item, or item of a category, without going through the whole pool.
+
 # The item pool before starting items are processed, in case you want to see the raw item pool at that stage
-def before_create_items_starting(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def before_create_items_starting(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
 
     # Use this hook to remove items from the item pool
     itemNamesToRemove = [] # List of item names
@@ -124,14 +132,13 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
                 multiworld.clear_location_cache()
 
     for itemName in itemNamesToRemove:
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+        item_pool.take(itemName)
         print("Successfully removed " + itemName)   # debug
 
     return item_pool
 
 # The item pool after starting items are processed but before filler is added, in case you want to see the raw item pool at that stage
-def before_create_items_filler(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def before_create_items_filler(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
     # Use this hook to remove items from the item pool
     itemNamesToRemove = [] # List of item names
 
@@ -155,15 +162,13 @@ def before_create_items_filler(item_pool: list, world: World, multiworld: MultiW
         for location in location_table:
             if "Level Completion" in location["category"] and is_location_name_enabled(multiworld,player,location["name"]): 
                 level = multiworld.get_location(location["name"], player)
-                item_to_place = next(i for i in item_pool if i.name == "Map of Arkus Fragment")
+                item_to_place = item_pool.take("Map of Arkus Fragment")
                 level.place_locked_item(item_to_place)
-                item_pool.remove(item_to_place)
 
 
 
     for itemName in itemNamesToRemove:
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+        item_pool.take(itemName)
 
 
     # since the traps are weight-based, trap and filler generation needs to be overridden here
@@ -206,12 +211,11 @@ def before_create_items_filler(item_pool: list, world: World, multiworld: MultiW
 
     ## Place an item at a specific location
     # location = next(l for l in multiworld.get_unfilled_locations(player=player) if l.name == "Location Name")
-    # item_to_place = next(i for i in item_pool if i.name == "Item Name")
+    # item_to_place = item_pool.take("Item Name")
     # location.place_locked_item(item_to_place)
-    # item_pool.remove(item_to_place)
 
 # The complete item pool prior to being set for generation is provided here, in case you want to make changes to it
-def after_create_items(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def after_create_items(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
     
     return item_pool
 
@@ -240,10 +244,12 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
     # location.access_rule = lambda state: old_rule(state) or Example_Rule(state)
 
 # The item name to create is provided before the item is created, in case you want to make changes to it
+@passthrough_hook
 def before_create_item(item_name: str, world: World, multiworld: MultiWorld, player: int) -> str:
     return item_name
 
 # The item that was created is provided after creation, in case you want to modify the item
+@passthrough_hook
 def after_create_item(item: ManualItem, world: World, multiworld: MultiWorld, player: int) -> ManualItem:
     return item
 
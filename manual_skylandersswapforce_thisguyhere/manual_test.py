@@ -1,6 +1,135 @@
+import random
+
+from BaseClasses import CollectionState
 from test.TestBase import WorldTestBase
 from .Game import game_name
+from .Helpers import get_items_for_player
+from .Items import ItemPool, item_category_names
+from .Regions import regionMap
+from .Rules import RequiresConst, RequiresRule, build_requires_rule, fullLocationOrRegionCheck, get_requires_dependencies
 
 
 class ManualTest(WorldTestBase):
     game = game_name
+
+    def random_states(self, rng: random.Random):
+        """Yields random states, then one state after each step of a random walk of collects and removes"""
+        items = [item for item in self.multiworld.get_items() if item.player == self.player and item.advancement]
+        for _ in range(10):
+            state = CollectionState(self.multiworld)
+            for item in rng.sample(items, rng.randint(0, len(items))):
+                state.collect(item, True)
+            yield state
+
+        state = CollectionState(self.multiworld)
+        collected = []
+        for _ in range(40):
+            if collected and rng.random() < 0.4:
+                state.remove(collected.pop(rng.randrange(len(collected))))
+            else:
+                collected.append(rng.choice(items))
+                state.collect(collected[-1], True)
+            yield state
+
+    def test_item_pool_works_like_a_list(self):
+        """The ItemPool given to the hooks gives the same results as a list for the same operations"""
+        rng = random.Random(0)
+        names = sorted(item_category_names)[:6]
+        new_item = lambda: self.world.create_item(rng.choice(names))
+        for _ in range(100):
+            expected = [new_item() for _ in range(rng.randint(0, 12))]
+            pool = ItemPool(expected)
+            for _ in range(30):
+                operation = rng.randrange(8)
+                item = new_item()
+                if operation == 0:
+                    pool.append(item)
+                    expected.append(item)
+                elif operation == 1 and expected:
+                    index = rng.randrange(-len(expected), len(expected))
+                    pool[index] = item
+                    expected[index] = item
+                elif operation == 2 and expected:
+                    index = rng.randrange(-len(expected), len(expected))
+                    self.assertIs(pool.pop(index), expected.pop(index))
+                elif operation == 3:
+                    index = rng.randint(-15, 15)
+                    pool.insert(index, item)
+                    expected.insert(index, item)
+                elif operation == 4 and item in expected:
+                    self.assertEqual(pool.index(item), expected.index(item))
+                    pool.remove(item)
+                    expected.remove(item)
+                elif operation == 5:
+                    start, stop = sorted(rng.randint(-15, 15) for _ in range(2))
+                    del pool[start:stop]
+                    del expected[start:stop]
+                elif operation == 6 and any(other.name == item.name for other in expected):
+                    taken = pool.take(item.name)
+                    self.assertIs(taken, next(other for other in expected if other.name == item.name))
+                    expected.remove(taken)
+                elif operation == 7:
+                    pool.sort(key=lambda other: other.name)
+                    expected.sort(key=lambda other: other.name)
+                self.assertEqual([id(other) for other in pool], [id(other) for other in expected])
+                self.assertEqual(pool.count(item), expected.count(item))
+                for category in item_category_names.get(item.name, ()):
+                    self.assertEqual(pool.in_categories([category]),
+                                     [other for other in expected if category in item_category_names.get(other.name, ())])
+
+    def test_access_rules_match_the_reference_evaluator(self):
+        """The compiled location and entrance rules give the same results as checking the requires strings"""
+        locations = []
+        for location in self.multiworld.get_locations(self.player):
+            area = self.world.location_name_to_location.get(location.name, {})
+            locations.append((location, area, regionMap.get(area.get("region"), {})))
+        entrances = [(entrance, regionMap.get(region.name, {}) if region.name != "Menu" else {})
+                     for region in self.multiworld.get_regions(self.player) for entrance in region.exits]
+
+        for state in self.random_states(random.Random(1)):
+            for location, area, region in locations:
+                expected = fullLocationOrRegionCheck(state, self.player, area) and fullLocationOrRegionCheck(state, self.player, region)
+                self.assertEqual(bool(location.access_rule(state)), bool(expected), location.name)
+            for entrance, region in entrances:
+                expected = fullLocationOrRegionCheck(state, self.player, region)
+                self.assertEqual(bool(entrance.access_rule(state)), bool(expected), entrance.name)
+
+    def test_direct_access_rules_match_reachability(self):
+        """The direct access rule of each location agrees with reaching it through the regions"""
+        for state in self.random_states(random.Random(2)):
+            for location in self.multiworld.get_locations(self.player):
+                self.assertEqual(bool(self.world.get_direct_access_rule(location.name)(state)),
+                                 bool(location.can_reach(state)), location.name)
+
+    def test_item_dependents_cover_the_changed_rules(self):
+        """Every location rule changed by collecting an item is one of the item's dependents"""
+        rng = random.Random(3)
+        items = [item for item in self.multiworld.get_items() if item.player == self.player and item.advancement]
+        for state in self.random_states(rng):
+            before = {location.name: bool(location.access_rule(state)) for location in self.multiworld.get_locations(self.player)}
+            item = rng.choice(items)
+            state = state.copy()
+            state.collect(item, True)
+            dependents = self.world.get_item_dependents(item.name)
+            for location in self.multiworld.get_locations(self.player):
+                if bool(location.access_rule(state)) != before[location.name]:
+                    self.assertIn(location.name, dependents.locations, item.name)
+
+    def test_rules_calling_functions_returning_requires_depend_on_any_item(self):
+        """OptOne returns a requires string checking its item, which its decorator doesn't list"""
+        area = {"name": "Test", "requires": "{ItemValue(Coins:0)} and {OptOne(Progressive Chapter:2)}"}
+        rule = RequiresRule(area, self.player, RequiresConst(True))
+        build_requires_rule(self.world, rule)
+        self.assertIsNone(get_requires_dependencies(self.world, rule))
+
+    def test_item_index_follows_items_replaced_in_the_pool(self):
+        """Items replaced in the pool without changing its length, like AP's start inventory from pool, are seen by pre_fill"""
+        pool = list(self.multiworld.itempool)
+        index = next(i for i, item in enumerate(pool) if item.player == self.player and item.advancement)
+        name = pool[index].name
+        count = lambda: sum(item.name == name for item in get_items_for_player(self.multiworld, self.player))
+        expected = count() - 1
+        pool[index] = self.world.create_item(self.world.get_filler_item_name())
+        self.multiworld.itempool[:] = pool
+        self.world.pre_fill()
+        self.assertEqual(count(), expected)